@@ -1,12 +1,40 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 from .models import CV, CoverLetter, ExtractedLine, User
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses PostgreSQL's planner row estimate (pg_class.reltuples) for
+    unfiltered change lists on large tables instead of a full COUNT(*).
+    Filtered or small querysets still get an exact count.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            with connections[self.object_list.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
-    list_display = ["email", "first_name", "last_name", "is_active", "created_at"]
+    # active_lines_count is the trigger-maintained counter: no COUNT per listed user
+    list_display = ["email", "first_name", "last_name", "is_active", "active_lines_count", "created_at"]
     search_fields = ["email", "first_name", "last_name"]
     ordering = ["-created_at"]
 
@@ -46,7 +74,31 @@ class ExtractedLineAdmin(admin.ModelAdmin):
     search_fields = ["content", "user__email"]
     raw_id_fields = ["user", "source_cv"]
     ordering = ["content_type", "order"]
+    actions = ["activate_lines", "deactivate_lines", "toggle_lines", "mark_lines_modified"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     @admin.display(description="Contenu")
     def content_preview(self, obj):
         return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
+
+    # Bulk actions run a single UPDATE for the whole selection instead of one save() per line
+    @admin.action(description="Activer les lignes sélectionnées")
+    def activate_lines(self, request, queryset):
+        updated = queryset.update(is_active=True, modified_at=timezone.now())
+        self.message_user(request, f"{updated} ligne(s) activée(s).")
+
+    @admin.action(description="Désactiver les lignes sélectionnées")
+    def deactivate_lines(self, request, queryset):
+        updated = queryset.update(is_active=False, modified_at=timezone.now())
+        self.message_user(request, f"{updated} ligne(s) désactivée(s).")
+
+    @admin.action(description="Inverser l'état actif des lignes sélectionnées")
+    def toggle_lines(self, request, queryset):
+        updated = queryset.toggle_active()
+        self.message_user(request, f"{updated} ligne(s) inversée(s).")
+
+    @admin.action(description="Marquer les lignes sélectionnées comme modifiées")
+    def mark_lines_modified(self, request, queryset):
+        updated = queryset.mark_as_modified()
+        self.message_user(request, f"{updated} ligne(s) marquée(s) comme modifiée(s).")
@@ -0,0 +1,120 @@
+import orjson
+from django import forms
+from django.core.validators import RegexValidator
+from django.db import models
+from django.db.backends.postgresql.psycopg_any import Jsonb
+from django.db.models.fields.json import KeyTransform
+from django.utils.functional import cached_property
+
+
+class HexColorField(models.PositiveIntegerField):
+    """
+    RGB color stored as a 24-bit packed integer (fixed-width column).
+    The Python value stays a '#rrggbb' string, so templates and JS config are unchanged.
+    """
+
+    default_validators = [
+        RegexValidator(r"^#[0-9a-fA-F]{6}$", "Couleur hexadécimale attendue (ex: #667eea).", code="invalid_color"),
+    ]
+
+    @cached_property
+    def validators(self):
+        # Skip IntegerField range validators: the Python value is a string
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return f"#{value:06x}"
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return f"#{int(value):06x}"
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, str):
+            return int(value.lstrip("#"), 16)
+        return int(value)
+
+    def formfield(self, **kwargs):
+        return models.Field.formfield(self, **{"form_class": forms.CharField, "max_length": 7, **kwargs})
+
+
+class SmallIntChoiceField(models.PositiveSmallIntegerField):
+    """
+    Choice field stored as a smallint code (2-byte column and index keys).
+    The Python value stays the string choice key ("experience", ...), so filters,
+    templates and JSON payloads keep using strings. `codes` maps each key to its
+    stored integer and must never renumber existing keys.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.keys_by_code = {code: key for key, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["codes"] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Skip IntegerField range validators: the Python value is a string
+        return list(self._validators)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.keys_by_code.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int) and value in self.keys_by_code:
+            return self.keys_by_code[value]
+        return value
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f"Unknown {self.name!r} value: {value!r}") from None
+
+
+def _orjson_dumps(value):
+    return orjson.dumps(value).decode()
+
+
+class OrjsonJSONField(models.JSONField):
+    """
+    JSONField (PostgreSQL jsonb) encoded and decoded with orjson instead of the stdlib json module.
+    For payloads written or read on hot paths (chat messages and contexts); values must be
+    plain JSON types, custom encoder/decoder classes are not supported.
+    """
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if isinstance(value, models.Value) and isinstance(value.output_field, models.JSONField):
+            value = value.value
+        elif hasattr(value, "as_sql"):
+            # Expressions (including DatabaseDefault) are compiled, not adapted
+            return value
+        if connection.vendor != "postgresql":
+            return super().get_db_prep_value(value, connection, prepared=True)
+        return Jsonb(value, dumps=_orjson_dumps)
+
+    def from_db_value(self, value, expression, connection):
+        # Same handling as JSONField.from_db_value(), with orjson.loads()
+        if value is None:
+            return value
+        if isinstance(expression, KeyTransform) and not isinstance(value, str):
+            return value
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
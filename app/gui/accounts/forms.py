@@ -18,6 +18,13 @@ class UserRegistrationForm(UserCreationForm):
         model = User
         fields = ["email", "username", "password1", "password2"]
 
+    def clean_email(self):
+        # Stored lowercased (User.save()): report case variants on the field
+        email = self.cleaned_data.get("email", "").lower()
+        if User.objects.filter(email=email).exists():
+            raise forms.ValidationError("Cette adresse email est déjà utilisée.")
+        return email
+
     def save(self, commit=True):
         user = super().save(commit=False)
         user.email = self.cleaned_data["email"]
@@ -83,13 +90,13 @@ class UserProfileForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Initialize contract_types from JSONField
+        # Initialize contract_types from the array field
         if self.instance and self.instance.contract_types:
             self.initial["contract_types"] = self.instance.contract_types
 
     def save(self, commit=True):
         instance = super().save(commit=False)
-        # Save contract_types as list to JSONField
+        # Save contract_types as a list to the array field
         instance.contract_types = self.cleaned_data.get("contract_types", [])
         if commit:
             instance.save()
@@ -162,7 +169,8 @@ class AccountEmailForm(forms.ModelForm):
         }
 
     def clean_email(self):
-        email = self.cleaned_data.get("email")
+        # Stored lowercased (User.save())
+        email = self.cleaned_data.get("email", "").lower()
         if User.objects.exclude(pk=self.instance.pk).filter(email=email).exists():
             raise forms.ValidationError("Cette adresse email est déjà utilisée.")
         return email
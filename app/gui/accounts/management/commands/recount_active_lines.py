@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = "Recompute the trigger-maintained active lines counters of users from their extracted lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_ids", nargs="*", type=int, help="Only recount these users (default: all)")
+
+    def handle(self, *args, user_ids, **options):
+        updated = User.objects.recount_active_lines(user_ids or None)
+        self.stdout.write(self.style.SUCCESS(f"Recounted active lines of {updated} user(s)."))
@@ -3,36 +3,46 @@
 import django.db.models.deletion
 from django.db import migrations, models
 
-
-def create_default_template(apps, schema_editor):
-    """Create the default professional DOCX template."""
-    DocxTemplate = apps.get_model("accounts", "DocxTemplate")
-    DocxTemplate.objects.create(
-        name="Professionnel",
-        description="Template professionnel avec police Calibri, couleur d'accent bleue et marges de 2cm.",
-        font_name="Calibri",
-        font_size_name=32,  # 16pt
-        font_size_section=24,  # 12pt
-        font_size_body=20,  # 10pt
-        accent_color="#667eea",
-        margin_top=1134,  # 2cm
-        margin_right=1134,
-        margin_bottom=1134,
-        margin_left=1134,
-        line_spacing=276,  # 1.15
-        paragraph_spacing_after=120,
-        is_default=True,
-        is_system=True,
+# The default template is inserted with raw SQL rather than through
+# apps.get_model(), so the historical model state does not have to be rendered.
+CREATE_DEFAULT_TEMPLATE_SQL = """
+    INSERT INTO accounts_docxtemplate (
+        name, description, font_name, font_size_name, font_size_section, font_size_body,
+        accent_color, margin_top, margin_right, margin_bottom, margin_left,
+        line_spacing, paragraph_spacing_after, is_default, is_system, created_at, updated_at
+    ) VALUES (
+        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW()
     )
+"""
 
+DEFAULT_TEMPLATE_PARAMS = [
+    "Professionnel",
+    "Template professionnel avec police Calibri, couleur d'accent bleue et marges de 2cm.",
+    "Calibri",
+    32,  # font_size_name: 16pt
+    24,  # font_size_section: 12pt
+    20,  # font_size_body: 10pt
+    "#667eea",
+    1134,  # margin_top: 2cm
+    1134,
+    1134,
+    1134,
+    276,  # line_spacing: 1.15
+    120,
+    True,  # is_default
+    True,  # is_system
+]
 
-def reverse_create_default_template(apps, schema_editor):
-    """Remove the default template."""
-    DocxTemplate = apps.get_model("accounts", "DocxTemplate")
-    DocxTemplate.objects.filter(name="Professionnel", is_system=True).delete()
+DELETE_DEFAULT_TEMPLATE_SQL = "DELETE FROM accounts_docxtemplate WHERE name = %s AND is_system"
 
 
 class Migration(migrations.Migration):
+    # Not atomic: the statements run in autocommit, so the DDL locks taken by
+    # CreateModel/AddField are released before the default row is inserted.
+    # A failure after CreateModel leaves the migration half-applied; it cannot
+    # simply be re-run and the created objects must be dropped by hand first.
+    atomic = False
+
     dependencies = [
         ("accounts", "0016_add_application_model"),
     ]
@@ -167,8 +177,8 @@ class Migration(migrations.Migration):
             ),
         ),
         # Create default template
-        migrations.RunPython(
-            create_default_template,
-            reverse_create_default_template,
+        migrations.RunSQL(
+            sql=[(CREATE_DEFAULT_TEMPLATE_SQL, DEFAULT_TEMPLATE_PARAMS)],
+            reverse_sql=[(DELETE_DEFAULT_TEMPLATE_SQL, ["Professionnel"])],
         ),
     ]
@@ -0,0 +1,89 @@
+# Denormalized active extracted lines counter on User, maintained by triggers
+
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+    UPDATE accounts_user u
+    SET active_lines_count = (
+        SELECT COUNT(*) FROM accounts_extractedline el
+        WHERE el.user_id = u.id AND el.is_active
+    );
+"""
+
+CREATE_TRIGGERS_SQL = """
+    CREATE FUNCTION accounts_extractedline_active_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            IF OLD.is_active THEN
+                UPDATE accounts_user SET active_lines_count = active_lines_count - 1
+                WHERE id = OLD.user_id;
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            IF NEW.is_active THEN
+                UPDATE accounts_user SET active_lines_count = active_lines_count + 1
+                WHERE id = NEW.user_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER accounts_extractedline_active_count_ins
+        AFTER INSERT ON accounts_extractedline
+        FOR EACH ROW EXECUTE FUNCTION accounts_extractedline_active_count();
+
+    CREATE TRIGGER accounts_extractedline_active_count_upd
+        AFTER UPDATE OF is_active, user_id ON accounts_extractedline
+        FOR EACH ROW
+        WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION accounts_extractedline_active_count();
+
+    CREATE TRIGGER accounts_extractedline_active_count_del
+        AFTER DELETE ON accounts_extractedline
+        FOR EACH ROW EXECUTE FUNCTION accounts_extractedline_active_count();
+
+    -- User.save() writes every column: keep the stored counter unless the
+    -- UPDATE comes from the extractedline trigger above (nested, depth > 1).
+    CREATE FUNCTION accounts_user_keep_active_lines_count() RETURNS trigger AS $$
+    BEGIN
+        IF pg_trigger_depth() = 1 THEN
+            NEW.active_lines_count := OLD.active_lines_count;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER accounts_user_keep_active_lines_count
+        BEFORE UPDATE OF active_lines_count ON accounts_user
+        FOR EACH ROW EXECUTE FUNCTION accounts_user_keep_active_lines_count();
+"""
+
+DROP_TRIGGERS_SQL = """
+    DROP TRIGGER IF EXISTS accounts_user_keep_active_lines_count ON accounts_user;
+    DROP FUNCTION IF EXISTS accounts_user_keep_active_lines_count();
+    DROP TRIGGER IF EXISTS accounts_extractedline_active_count_ins ON accounts_extractedline;
+    DROP TRIGGER IF EXISTS accounts_extractedline_active_count_upd ON accounts_extractedline;
+    DROP TRIGGER IF EXISTS accounts_extractedline_active_count_del ON accounts_extractedline;
+    DROP FUNCTION IF EXISTS accounts_extractedline_active_count();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0019_userllmconfig_llm_api_mode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="active_lines_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of active extracted lines (maintained by database triggers)",
+            ),
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=CREATE_TRIGGERS_SQL, reverse_sql=DROP_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,51 @@
+# Store DocxTemplate.accent_color as a packed 24-bit RGB integer
+
+from django.db import migrations, models
+
+import accounts.fields
+
+HEX_TO_INT_SQL = """
+    UPDATE accounts_docxtemplate
+    SET accent_color_rgb = CASE
+        WHEN accent_color ~* '^#?[0-9a-f]{6}$'
+            THEN ('x' || ltrim(accent_color, '#'))::bit(24)::integer
+        ELSE 6717162  -- #667eea
+    END;
+"""
+
+INT_TO_HEX_SQL = """
+    UPDATE accounts_docxtemplate
+    SET accent_color = '#' || lpad(to_hex(accent_color_rgb), 6, '0');
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0020_user_active_lines_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="docxtemplate",
+            name="accent_color_rgb",
+            field=models.PositiveIntegerField(default=6717162),
+        ),
+        migrations.RunSQL(sql=HEX_TO_INT_SQL, reverse_sql=INT_TO_HEX_SQL),
+        migrations.RemoveField(
+            model_name="docxtemplate",
+            name="accent_color",
+        ),
+        migrations.RenameField(
+            model_name="docxtemplate",
+            old_name="accent_color_rgb",
+            new_name="accent_color",
+        ),
+        migrations.AlterField(
+            model_name="docxtemplate",
+            name="accent_color",
+            field=accounts.fields.HexColorField(
+                default="#667eea",
+                help_text="Accent color for section titles (hex format, e.g., '#667eea')",
+            ),
+        ),
+    ]
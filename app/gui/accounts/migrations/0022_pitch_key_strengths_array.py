@@ -0,0 +1,54 @@
+# Convert Pitch.key_strengths from jsonb to a native varchar(100)[] array
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+JSON_TO_ARRAY_SQL = """
+    UPDATE accounts_pitch
+    SET key_strengths_array = ARRAY(
+        SELECT left(elem, 100) FROM jsonb_array_elements_text(key_strengths) AS elem
+    )
+    WHERE jsonb_typeof(key_strengths) = 'array';
+"""
+
+ARRAY_TO_JSON_SQL = """
+    UPDATE accounts_pitch SET key_strengths = to_jsonb(key_strengths_array);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0021_docxtemplate_accent_color_int"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pitch",
+            name="key_strengths_array",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                size=5,
+            ),
+        ),
+        migrations.RunSQL(sql=JSON_TO_ARRAY_SQL, reverse_sql=ARRAY_TO_JSON_SQL),
+        migrations.RemoveField(
+            model_name="pitch",
+            name="key_strengths",
+        ),
+        migrations.RenameField(
+            model_name="pitch",
+            old_name="key_strengths_array",
+            new_name="key_strengths",
+        ),
+        migrations.AlterField(
+            model_name="pitch",
+            name="key_strengths",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                help_text="List of 3-5 key strengths highlighted in this pitch",
+                size=5,
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 16:43
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # accounts_extractedline is a live, large table: build/drop indexes without
+    # holding a write lock (CONCURRENTLY cannot run inside a transaction).
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0022_pitch_key_strengths_array"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="extractedline",
+            index=models.Index(
+                fields=["user", "content_type", "order", "-created_at"], name="accounts_ex_user_id_a547da_idx"
+            ),
+        ),
+        # (user, content_type) is a prefix of the new index
+        RemoveIndexConcurrently(
+            model_name="extractedline",
+            name="accounts_ex_user_id_73cd25_idx",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0023_extractedline_ordering_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="candidateprofile",
+            index=models.Index(
+                condition=models.Q(("is_default", True)), fields=["user"], name="cp_default_per_user_idx"
+            ),
+        ),
+    ]
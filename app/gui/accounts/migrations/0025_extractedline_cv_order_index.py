@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0024_candidateprofile_default_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="extractedline",
+            index=models.Index(fields=["source_cv", "content_type", "order", "-created_at"], name="el_cv_ctype_order"),
+        ),
+        RemoveIndexConcurrently(
+            model_name="extractedline",
+            name="accounts_ex_source__6710e9_idx",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:31
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0025_extractedline_cv_order_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="extractedline",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["user", "content_type", "order", "-created_at"],
+                name="el_active_user_ctype_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Convert User.contract_types from jsonb to a varchar(20)[] array with a GIN index
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+CONTRACT_TYPE_CHOICES = [
+    ("cdi", "CDI"),
+    ("cdd", "CDD"),
+    ("freelance", "Freelance"),
+    ("alternance", "Alternance"),
+]
+
+JSON_TO_ARRAY_SQL = """
+    UPDATE accounts_user
+    SET contract_types_array = ARRAY(
+        SELECT left(elem, 20) FROM jsonb_array_elements_text(contract_types) AS elem
+    )
+    WHERE jsonb_typeof(contract_types) = 'array';
+"""
+
+ARRAY_TO_JSON_SQL = """
+    UPDATE accounts_user SET contract_types = to_jsonb(contract_types_array);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0026_extractedline_active_partial_index"),
+    ]
+
+    # The column is rebuilt anyway, so the GIN index is created in the same
+    # transaction (nothing to gain from CONCURRENTLY here).
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="contract_types_array",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(choices=CONTRACT_TYPE_CHOICES, max_length=20),
+                blank=True,
+                default=list,
+            ),
+        ),
+        migrations.RunSQL(sql=JSON_TO_ARRAY_SQL, reverse_sql=ARRAY_TO_JSON_SQL),
+        migrations.RemoveField(
+            model_name="user",
+            name="contract_types",
+        ),
+        migrations.RenameField(
+            model_name="user",
+            old_name="contract_types_array",
+            new_name="contract_types",
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="contract_types",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(choices=CONTRACT_TYPE_CHOICES, max_length=20),
+                blank=True,
+                default=list,
+                help_text="List of desired contract types (cdi, cdd, freelance, alternance)",
+                size=None,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["contract_types"], name="user_contract_types_gin"),
+        ),
+    ]
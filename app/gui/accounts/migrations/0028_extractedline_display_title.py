@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:52
+
+from django.db import migrations, models
+
+# Same rule as ExtractedLine._build_display_title()
+BACKFILL_SQL = """
+    UPDATE accounts_extractedline
+    SET display_title = CASE
+        WHEN COALESCE(position, '') <> '' THEN position
+        WHEN length(content) > 50 THEN left(content, 50) || '...'
+        ELSE content
+    END;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0027_user_contract_types_array"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="extractedline",
+            name="display_title",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Display title (position, or truncated content)",
+                max_length=255,
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
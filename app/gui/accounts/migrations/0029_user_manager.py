@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:04
+
+from django.db import migrations
+
+import accounts.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0028_extractedline_display_title"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", accounts.models.UserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Store ExtractedLine.content_type as a smallint code (see CONTENT_TYPE_CODES)
+
+from django.db import migrations
+
+import accounts.fields
+
+CONTENT_TYPE_CHOICES = [
+    ("summary", "Resume / Accroche"),
+    ("experience", "Experience professionnelle"),
+    ("education", "Formation"),
+    ("skill_hard", "Competence technique"),
+    ("skill_soft", "Soft skill"),
+    ("language", "Langue"),
+    ("certification", "Certification"),
+    ("interest", "Centre d'interet"),
+    ("personal_info", "Informations personnelles"),
+    ("social_link", "Lien social"),
+    ("other", "Autre"),
+]
+
+CONTENT_TYPE_CODES = {
+    "certification": 1,
+    "education": 2,
+    "experience": 3,
+    "interest": 4,
+    "language": 5,
+    "other": 6,
+    "personal_info": 7,
+    "skill_hard": 8,
+    "skill_soft": 9,
+    "social_link": 10,
+    "summary": 11,
+}
+
+# The varchar_pattern_ops (LIKE) index cannot exist on a smallint column.
+# ALTER TYPE rewrites the table and rebuilds the other indexes on content_type.
+TO_SMALLINT_SQL = """
+    DROP INDEX IF EXISTS accounts_extractedline_content_type_1f2bea90_like;
+    ALTER TABLE accounts_extractedline
+        ALTER COLUMN content_type TYPE smallint USING CASE content_type
+            WHEN 'certification' THEN 1
+            WHEN 'education' THEN 2
+            WHEN 'experience' THEN 3
+            WHEN 'interest' THEN 4
+            WHEN 'language' THEN 5
+            WHEN 'other' THEN 6
+            WHEN 'personal_info' THEN 7
+            WHEN 'skill_hard' THEN 8
+            WHEN 'skill_soft' THEN 9
+            WHEN 'social_link' THEN 10
+            WHEN 'summary' THEN 11
+            ELSE 6
+        END;
+    ALTER TABLE accounts_extractedline
+        ADD CONSTRAINT accounts_extractedline_content_type_check CHECK (content_type >= 0);
+"""
+
+TO_VARCHAR_SQL = """
+    ALTER TABLE accounts_extractedline DROP CONSTRAINT accounts_extractedline_content_type_check;
+    ALTER TABLE accounts_extractedline
+        ALTER COLUMN content_type TYPE varchar(20) USING CASE content_type
+            WHEN 1 THEN 'certification'
+            WHEN 2 THEN 'education'
+            WHEN 3 THEN 'experience'
+            WHEN 4 THEN 'interest'
+            WHEN 5 THEN 'language'
+            WHEN 6 THEN 'other'
+            WHEN 7 THEN 'personal_info'
+            WHEN 8 THEN 'skill_hard'
+            WHEN 9 THEN 'skill_soft'
+            WHEN 10 THEN 'social_link'
+            WHEN 11 THEN 'summary'
+            ELSE 'other'
+        END;
+    CREATE INDEX accounts_extractedline_content_type_1f2bea90_like
+        ON accounts_extractedline (content_type varchar_pattern_ops);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0029_user_manager"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(sql=TO_SMALLINT_SQL, reverse_sql=TO_VARCHAR_SQL),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="extractedline",
+                    name="content_type",
+                    field=accounts.fields.SmallIntChoiceField(
+                        choices=CONTENT_TYPE_CHOICES,
+                        codes=CONTENT_TYPE_CODES,
+                        db_index=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:14
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+# Same rule as ExtractedLine.save()
+BACKFILL_SQL = """
+    UPDATE accounts_extractedline
+    SET is_structured = true
+    WHERE entity IS NOT NULL OR position IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0030_extractedline_content_type_smallint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="extractedline",
+            name="is_structured",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Line has structured data (entity or position)",
+            ),
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        AddIndexConcurrently(
+            model_name="extractedline",
+            index=models.Index(
+                condition=models.Q(("is_structured", True)),
+                fields=["user"],
+                name="el_structured_idx",
+            ),
+        ),
+    ]
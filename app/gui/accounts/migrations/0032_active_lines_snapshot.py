@@ -0,0 +1,107 @@
+# Materialized view of active extracted lines per (user, content_type), see ActiveLinesSnapshot
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import accounts.fields
+
+CONTENT_TYPE_CHOICES = [
+    ("summary", "Resume / Accroche"),
+    ("experience", "Experience professionnelle"),
+    ("education", "Formation"),
+    ("skill_hard", "Competence technique"),
+    ("skill_soft", "Soft skill"),
+    ("language", "Langue"),
+    ("certification", "Certification"),
+    ("interest", "Centre d'interet"),
+    ("personal_info", "Informations personnelles"),
+    ("social_link", "Lien social"),
+    ("other", "Autre"),
+]
+
+CONTENT_TYPE_CODES = {
+    "certification": 1,
+    "education": 2,
+    "experience": 3,
+    "interest": 4,
+    "language": 5,
+    "other": 6,
+    "personal_info": 7,
+    "skill_hard": 8,
+    "skill_soft": 9,
+    "social_link": 10,
+    "summary": 11,
+}
+
+# Same items and order as User.get_consolidated_profile_data()
+CREATE_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_user_active_lines AS
+    SELECT
+        user_id,
+        content_type,
+        jsonb_agg(
+            jsonb_build_object(
+                'id', id,
+                'content', content,
+                'entity', entity,
+                'dates', dates,
+                'position', position,
+                'description', description
+            )
+            ORDER BY "order", created_at DESC
+        ) AS lines
+    FROM accounts_extractedline
+    WHERE is_active
+    GROUP BY user_id, content_type;
+
+    -- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    CREATE UNIQUE INDEX mv_user_active_lines_pk ON mv_user_active_lines (user_id, content_type);
+"""
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW mv_user_active_lines;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0031_extractedline_is_structured"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_VIEW_SQL,
+            reverse_sql=DROP_VIEW_SQL,
+            state_operations=[
+                migrations.CreateModel(
+                    name="ActiveLinesSnapshot",
+                    fields=[
+                        (
+                            "pk",
+                            models.CompositePrimaryKey(
+                                "user", "content_type", blank=True, editable=False, primary_key=True, serialize=False
+                            ),
+                        ),
+                        (
+                            "content_type",
+                            accounts.fields.SmallIntChoiceField(choices=CONTENT_TYPE_CHOICES, codes=CONTENT_TYPE_CODES),
+                        ),
+                        ("lines", models.JSONField(help_text="Same items as User.get_consolidated_profile_data()")),
+                        (
+                            "user",
+                            models.ForeignKey(
+                                db_constraint=False,
+                                on_delete=django.db.models.deletion.DO_NOTHING,
+                                related_name="active_lines_snapshots",
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": "mv_user_active_lines",
+                        "managed": False,
+                    },
+                ),
+            ],
+        ),
+    ]
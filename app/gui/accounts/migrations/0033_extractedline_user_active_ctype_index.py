@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:52
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0032_active_lines_snapshot"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="extractedline",
+            index=models.Index(
+                fields=["user", "is_active", "content_type"],
+                include=["source_cv", "order"],
+                name="exline_user_active_ctype",
+            ),
+        ),
+        # (user, is_active) is a prefix of the new index
+        RemoveIndexConcurrently(
+            model_name="extractedline",
+            name="accounts_ex_user_id_3aafea_idx",
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Drop the single-column ChatMessage.conversation index, covered by (conversation, created_at)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0033_extractedline_user_active_ctype_index"),
+    ]
+
+    operations = [
+        # conversation_id alone is a prefix of accounts_ch_convers_e1a524_idx (conversation, created_at)
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS accounts_chatmessage_conversation_id_f5f07136;",
+                    reverse_sql=(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_chatmessage_conversation_id_f5f07136 "
+                        "ON accounts_chatmessage (conversation_id);"
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chatmessage",
+                    name="conversation",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="messages",
+                        to="accounts.chatconversation",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:18
+
+from django.db import migrations, models
+
+# Same rule as ProfessionalSuccess.save() (a component counts when not blank after strip())
+BACKFILL_SQL = r"""
+    UPDATE accounts_professionalsuccess
+    SET filled_steps =
+        (btrim(situation, E' \t\n\r\f\v') <> '')::int
+        + (btrim(task, E' \t\n\r\f\v') <> '')::int
+        + (btrim(action, E' \t\n\r\f\v') <> '')::int
+        + (btrim(result, E' \t\n\r\f\v') <> '')::int;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0034_chatmessage_drop_conversation_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="professionalsuccess",
+            name="filled_steps",
+            field=models.PositiveSmallIntegerField(
+                default=0, editable=False, help_text="Number of filled STAR components (0-4)"
+            ),
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
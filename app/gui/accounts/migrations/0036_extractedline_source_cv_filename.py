@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:41
+
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+    UPDATE accounts_extractedline el
+    SET source_cv_filename = cv.original_filename
+    FROM accounts_cv cv
+    WHERE cv.id = el.source_cv_id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0035_professionalsuccess_filled_steps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="extractedline",
+            name="source_cv_filename",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Original filename of the source CV",
+                max_length=255,
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
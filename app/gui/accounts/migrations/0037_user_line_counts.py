@@ -0,0 +1,140 @@
+# Per content_type active lines counters on User, maintained by the 0020 triggers
+
+from django.db import migrations, models
+
+BACKFILL_SQL = """
+    UPDATE accounts_user u
+    SET line_counts = COALESCE(
+        (
+            SELECT jsonb_object_agg(el.content_type::text, el.n)
+            FROM (
+                SELECT content_type, COUNT(*) AS n FROM accounts_extractedline
+                WHERE user_id = u.id AND is_active
+                GROUP BY content_type
+            ) el
+        ),
+        '{}'::jsonb
+    );
+"""
+
+# One UPDATE per affected user row maintains both counters.
+# content_type changes now move a line between two line_counts keys.
+CREATE_TRIGGERS_SQL = """
+    CREATE OR REPLACE FUNCTION accounts_extractedline_active_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            IF OLD.is_active THEN
+                UPDATE accounts_user SET
+                    active_lines_count = active_lines_count - 1,
+                    line_counts = jsonb_set(
+                        line_counts,
+                        ARRAY[OLD.content_type::text],
+                        to_jsonb(COALESCE((line_counts ->> OLD.content_type::text)::int, 0) - 1)
+                    )
+                WHERE id = OLD.user_id;
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            IF NEW.is_active THEN
+                UPDATE accounts_user SET
+                    active_lines_count = active_lines_count + 1,
+                    line_counts = jsonb_set(
+                        line_counts,
+                        ARRAY[NEW.content_type::text],
+                        to_jsonb(COALESCE((line_counts ->> NEW.content_type::text)::int, 0) + 1)
+                    )
+                WHERE id = NEW.user_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER accounts_extractedline_active_count_upd ON accounts_extractedline;
+    CREATE TRIGGER accounts_extractedline_active_count_upd
+        AFTER UPDATE OF is_active, user_id, content_type ON accounts_extractedline
+        FOR EACH ROW
+        WHEN (
+            OLD.is_active IS DISTINCT FROM NEW.is_active
+            OR OLD.user_id IS DISTINCT FROM NEW.user_id
+            OR OLD.content_type IS DISTINCT FROM NEW.content_type
+        )
+        EXECUTE FUNCTION accounts_extractedline_active_count();
+
+    CREATE OR REPLACE FUNCTION accounts_user_keep_active_lines_count() RETURNS trigger AS $$
+    BEGIN
+        IF pg_trigger_depth() = 1 THEN
+            NEW.active_lines_count := OLD.active_lines_count;
+            NEW.line_counts := OLD.line_counts;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER accounts_user_keep_active_lines_count ON accounts_user;
+    CREATE TRIGGER accounts_user_keep_active_lines_count
+        BEFORE UPDATE OF active_lines_count, line_counts ON accounts_user
+        FOR EACH ROW EXECUTE FUNCTION accounts_user_keep_active_lines_count();
+"""
+
+# Definitions from migration 0020
+RESTORE_TRIGGERS_SQL = """
+    CREATE OR REPLACE FUNCTION accounts_extractedline_active_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            IF OLD.is_active THEN
+                UPDATE accounts_user SET active_lines_count = active_lines_count - 1
+                WHERE id = OLD.user_id;
+            END IF;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            IF NEW.is_active THEN
+                UPDATE accounts_user SET active_lines_count = active_lines_count + 1
+                WHERE id = NEW.user_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER accounts_extractedline_active_count_upd ON accounts_extractedline;
+    CREATE TRIGGER accounts_extractedline_active_count_upd
+        AFTER UPDATE OF is_active, user_id ON accounts_extractedline
+        FOR EACH ROW
+        WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active OR OLD.user_id IS DISTINCT FROM NEW.user_id)
+        EXECUTE FUNCTION accounts_extractedline_active_count();
+
+    CREATE OR REPLACE FUNCTION accounts_user_keep_active_lines_count() RETURNS trigger AS $$
+    BEGIN
+        IF pg_trigger_depth() = 1 THEN
+            NEW.active_lines_count := OLD.active_lines_count;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER accounts_user_keep_active_lines_count ON accounts_user;
+    CREATE TRIGGER accounts_user_keep_active_lines_count
+        BEFORE UPDATE OF active_lines_count ON accounts_user
+        FOR EACH ROW EXECUTE FUNCTION accounts_user_keep_active_lines_count();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0036_extractedline_source_cv_filename"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="line_counts",
+            field=models.JSONField(
+                default=dict,
+                editable=False,
+                help_text="Active extracted lines per content_type code (maintained by database triggers)",
+            ),
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=CREATE_TRIGGERS_SQL, reverse_sql=RESTORE_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,68 @@
+# Store ChatMessage.status as a smallint code (see MESSAGE_STATUS_CODES)
+
+from django.db import migrations
+
+import accounts.fields
+
+MESSAGE_STATUS_CHOICES = [
+    ("pending", "En attente"),
+    ("processing", "En cours"),
+    ("completed", "Terminee"),
+    ("failed", "Echec"),
+]
+
+MESSAGE_STATUS_CODES = {
+    "pending": 1,
+    "processing": 2,
+    "completed": 3,
+    "failed": 4,
+}
+
+TO_SMALLINT_SQL = """
+    ALTER TABLE accounts_chatmessage
+        ALTER COLUMN status TYPE smallint USING CASE status
+            WHEN 'pending' THEN 1
+            WHEN 'processing' THEN 2
+            WHEN 'completed' THEN 3
+            WHEN 'failed' THEN 4
+            ELSE 4
+        END;
+    ALTER TABLE accounts_chatmessage
+        ADD CONSTRAINT accounts_chatmessage_status_check CHECK (status >= 0);
+"""
+
+TO_VARCHAR_SQL = """
+    ALTER TABLE accounts_chatmessage DROP CONSTRAINT accounts_chatmessage_status_check;
+    ALTER TABLE accounts_chatmessage
+        ALTER COLUMN status TYPE varchar(20) USING CASE status
+            WHEN 1 THEN 'pending'
+            WHEN 2 THEN 'processing'
+            WHEN 3 THEN 'completed'
+            ELSE 'failed'
+        END;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0037_user_line_counts"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(sql=TO_SMALLINT_SQL, reverse_sql=TO_VARCHAR_SQL),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chatmessage",
+                    name="status",
+                    field=accounts.fields.SmallIntChoiceField(
+                        choices=MESSAGE_STATUS_CHOICES,
+                        codes=MESSAGE_STATUS_CODES,
+                        default="completed",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:12
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+CASE_COLLISIONS_SQL = """
+    SELECT lower(email), array_agg(id ORDER BY id)
+    FROM accounts_user
+    GROUP BY lower(email)
+    HAVING count(*) > 1
+    ORDER BY lower(email);
+"""
+
+
+def check_email_case_collisions(apps, schema_editor):
+    # Lowercasing two emails that differ only by case would hit the unique email index with an
+    # opaque IntegrityError: list the accounts to merge or rename instead
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(CASE_COLLISIONS_SQL)
+        collisions = cursor.fetchall()
+    if collisions:
+        details = "\n".join(f"  {email}: user ids {', '.join(map(str, ids))}" for email, ids in collisions)
+        raise RuntimeError(
+            "Accounts whose emails differ only by case must be merged or given distinct emails "
+            f"before emails are lowercased:\n{details}"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0038_chatmessage_status_smallint"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_email_case_collisions, migrations.RunPython.noop),
+        # Same normalization as User.save()
+        migrations.RunSQL(
+            sql="UPDATE accounts_user SET email = lower(email) WHERE email <> lower(email);",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Lower("email"),
+                name="user_email_ci_unique",
+                violation_error_message="Cette adresse email est déjà utilisée.",
+            ),
+        ),
+    ]
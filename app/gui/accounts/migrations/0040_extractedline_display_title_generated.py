@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:31
+
+import django.db.models.functions.text
+import django.db.models.lookups
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0039_user_email_ci_unique"),
+    ]
+
+    operations = [
+        # A column cannot be altered into a generated column: drop and re-add it
+        # (PostgreSQL computes the values for existing rows).
+        migrations.RemoveField(
+            model_name="extractedline",
+            name="display_title",
+        ),
+        migrations.AddField(
+            model_name="extractedline",
+            name="display_title",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(models.Q(("position", ""), _negated=True), position__isnull=False, then="position"),
+                    models.When(
+                        django.db.models.lookups.GreaterThan(django.db.models.functions.text.Length("content"), 50),
+                        then=django.db.models.functions.text.Concat(
+                            django.db.models.functions.text.Left("content", 50), models.Value("...")
+                        ),
+                    ),
+                    default="content",
+                    output_field=models.CharField(max_length=255),
+                ),
+                help_text="Display title (position, or truncated content)",
+                output_field=models.CharField(max_length=255),
+            ),
+        ),
+    ]
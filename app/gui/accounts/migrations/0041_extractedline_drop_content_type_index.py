@@ -0,0 +1,62 @@
+# Drop the single-column ExtractedLine.content_type index: content_type is never queried on its own,
+# every lookup is scoped by user or source_cv and served by the composite indexes
+
+from django.db import migrations
+
+import accounts.fields
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0040_extractedline_display_title_generated"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS accounts_extractedline_content_type_1f2bea90;",
+                    reverse_sql=(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_extractedline_content_type_1f2bea90 "
+                        "ON accounts_extractedline (content_type);"
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="extractedline",
+                    name="content_type",
+                    field=accounts.fields.SmallIntChoiceField(
+                        choices=[
+                            ("summary", "Resume / Accroche"),
+                            ("experience", "Experience professionnelle"),
+                            ("education", "Formation"),
+                            ("skill_hard", "Competence technique"),
+                            ("skill_soft", "Soft skill"),
+                            ("language", "Langue"),
+                            ("certification", "Certification"),
+                            ("interest", "Centre d'interet"),
+                            ("personal_info", "Informations personnelles"),
+                            ("social_link", "Lien social"),
+                            ("other", "Autre"),
+                        ],
+                        codes={
+                            "certification": 1,
+                            "education": 2,
+                            "experience": 3,
+                            "interest": 4,
+                            "language": 5,
+                            "other": 6,
+                            "personal_info": 7,
+                            "skill_hard": 8,
+                            "skill_soft": 9,
+                            "social_link": 10,
+                            "summary": 11,
+                        },
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:40
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0041_extractedline_drop_content_type_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="importedoffer",
+            index=models.Index(fields=["user", "status", "-match_score"], name="io_user_status_score_idx"),
+        ),
+        # (user, status) is a prefix of the new index
+        RemoveIndexConcurrently(
+            model_name="importedoffer",
+            name="accounts_im_user_id_786659_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="importedoffer",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["skills"], name="io_skills_gin"),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:58
+
+from django.db import migrations, models
+
+# Same normalization as ImportedOffer.sync_skills(): only string items of array `skills` values
+_OFFER_SKILLS_SQL = """
+    SELECT o.id AS offer_id, left(lower(btrim(s.item #>> '{}', E' \\t\\r\\n')), 255) AS name
+    FROM accounts_importedoffer o
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(o.skills) = 'array' THEN o.skills ELSE '[]'::jsonb END
+    ) AS s(item)
+    WHERE jsonb_typeof(s.item) = 'string'
+"""
+
+BACKFILL_SQL = f"""
+    INSERT INTO accounts_skill (name)
+    SELECT DISTINCT name FROM ({_OFFER_SKILLS_SQL}) AS offer_skills WHERE name <> ''
+    ON CONFLICT (name) DO NOTHING;
+
+    INSERT INTO accounts_importedoffer_skill_set (importedoffer_id, skill_id)
+    SELECT DISTINCT offer_skills.offer_id, skill.id
+    FROM ({_OFFER_SKILLS_SQL}) AS offer_skills
+    JOIN accounts_skill skill ON skill.name = offer_skills.name
+    ON CONFLICT DO NOTHING;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0042_importedoffer_score_skills_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+            ],
+            options={
+                "verbose_name": "Competence",
+                "verbose_name_plural": "Competences",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AddField(
+            model_name="importedoffer",
+            name="skill_set",
+            field=models.ManyToManyField(blank=True, related_name="offers", to="accounts.skill"),
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0043_skill"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="importedoffer",
+            index=models.Index(
+                condition=models.Q(("match_score__isnull", False), ("status", "new")),
+                fields=["user", "-match_score"],
+                name="io_new_by_score_idx",
+            ),
+        ),
+    ]
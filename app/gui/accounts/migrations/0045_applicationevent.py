@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# One ApplicationEvent row per object of the Application.history JSON array
+BACKFILL_SQL = """
+    INSERT INTO accounts_applicationevent (application_id, event_type, details, created_at)
+    SELECT
+        a.id,
+        left(coalesce(e.item ->> 'event', ''), 32),
+        coalesce(e.item ->> 'details', ''),
+        coalesce((e.item ->> 'date')::timestamptz, a.created_at)
+    FROM accounts_application a
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(a.history) = 'array' THEN a.history ELSE '[]'::jsonb END
+    ) AS e(item)
+    WHERE jsonb_typeof(e.item) = 'object';
+"""
+
+# Rebuild the JSON array (oldest first) when migrating backwards
+REVERSE_BACKFILL_SQL = """
+    UPDATE accounts_application a
+    SET history = coalesce(
+        (
+            SELECT jsonb_agg(
+                jsonb_build_object('date', ev.created_at, 'event', ev.event_type, 'details', ev.details)
+                ORDER BY ev.created_at
+            )
+            FROM accounts_applicationevent ev
+            WHERE ev.application_id = a.id
+        ),
+        '[]'::jsonb
+    );
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0044_importedoffer_new_by_score_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("event_type", models.CharField(max_length=32)),
+                ("details", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="accounts.application",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Evenement de candidature",
+                "verbose_name_plural": "Evenements de candidature",
+                "ordering": ["-created_at"],
+                "indexes": [models.Index(fields=["application", "-created_at"], name="appevent_app_created_idx")],
+            },
+        ),
+        migrations.RunSQL(sql=BACKFILL_SQL, reverse_sql=REVERSE_BACKFILL_SQL),
+        migrations.RemoveField(
+            model_name="application",
+            name="history",
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0045_applicationevent"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("accent_color__lte", 16777215)), name="docx_accent_hex_valid"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("margin_top__lte", 5670)), name="docx_margin_top_range"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("margin_right__lte", 5670)), name="docx_margin_right_range"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("margin_bottom__lte", 5670)), name="docx_margin_bottom_range"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("margin_left__lte", 5670)), name="docx_margin_left_range"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 10:40
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0046_docxtemplate_checks"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="importedoffer",
+            index=models.Index(
+                condition=models.Q(("match_score__isnull", False)),
+                fields=["user", "-match_score"],
+                name="io_user_score_desc",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-16 11:05
+
+from django.db import migrations, models
+
+# Keep the most recently updated default per user before enforcing uniqueness
+DEMOTE_EXTRA_DEFAULTS = """
+UPDATE {table} SET is_default = false
+WHERE is_default AND id NOT IN (
+    SELECT DISTINCT ON (user_id) id FROM {table}
+    WHERE is_default
+    ORDER BY user_id, updated_at DESC, id DESC
+);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0047_importedoffer_io_user_score_desc"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=DEMOTE_EXTRA_DEFAULTS.format(table="accounts_candidateprofile"),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            sql=DEMOTE_EXTRA_DEFAULTS.format(table="accounts_pitch"),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # The unique partial index replaces the plain one on the same rows
+        migrations.RemoveIndex(
+            model_name="candidateprofile",
+            name="cp_default_per_user_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="candidateprofile",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)), fields=("user",), name="cp_one_default_per_user"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pitch",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)), fields=("user",), name="pitch_one_default_per_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 11:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0048_one_default_per_user"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="chatmessage",
+            options={
+                "get_latest_by": "created_at",
+                "ordering": ["created_at"],
+                "verbose_name": "Message chat",
+                "verbose_name_plural": "Messages chat",
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Drop the single-column ExtractedLine FK indexes, covered by composite indexes
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0049_chatmessage_get_latest_by"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # user_id alone is a prefix of accounts_ex_user_id_a547da_idx (user, content_type, order, -created_at)
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS accounts_extractedline_user_id_2bb6622e;",
+                    reverse_sql=(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_extractedline_user_id_2bb6622e "
+                        "ON accounts_extractedline (user_id);"
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="extractedline",
+                    name="user",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="extracted_lines",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        # source_cv_id alone is a prefix of el_cv_ctype_order (source_cv, content_type, order, -created_at)
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS accounts_extractedline_source_cv_id_a3fbb3a6;",
+                    reverse_sql=(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS accounts_extractedline_source_cv_id_a3fbb3a6 "
+                        "ON accounts_extractedline (source_cv_id);"
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="extractedline",
+                    name="source_cv",
+                    field=models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="extracted_lines",
+                        to="accounts.cv",
+                    ),
+                ),
+            ],
+        ),
+    ]
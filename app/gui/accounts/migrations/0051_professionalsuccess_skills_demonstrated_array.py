@@ -0,0 +1,54 @@
+# Convert ProfessionalSuccess.skills_demonstrated from jsonb to a native varchar(100)[] array
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+JSON_TO_ARRAY_SQL = """
+    UPDATE accounts_professionalsuccess
+    SET skills_demonstrated_array = ARRAY(
+        SELECT left(elem, 100) FROM jsonb_array_elements_text(skills_demonstrated) AS elem
+    )
+    WHERE jsonb_typeof(skills_demonstrated) = 'array';
+"""
+
+ARRAY_TO_JSON_SQL = """
+    UPDATE accounts_professionalsuccess SET skills_demonstrated = to_jsonb(skills_demonstrated_array);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0050_extractedline_drop_fk_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="professionalsuccess",
+            name="skills_demonstrated_array",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                size=None,
+            ),
+        ),
+        migrations.RunSQL(sql=JSON_TO_ARRAY_SQL, reverse_sql=ARRAY_TO_JSON_SQL),
+        migrations.RemoveField(
+            model_name="professionalsuccess",
+            name="skills_demonstrated",
+        ),
+        migrations.RenameField(
+            model_name="professionalsuccess",
+            old_name="skills_demonstrated_array",
+            new_name="skills_demonstrated",
+        ),
+        migrations.AlterField(
+            model_name="professionalsuccess",
+            name="skills_demonstrated",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=100),
+                default=list,
+                help_text="List of skills demonstrated in this success",
+                size=None,
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 11:50
+
+from django.db import migrations, models
+
+# Same rule as Pitch.save() (_count_words, i.e. len(str.split())): count the runs of
+# non-whitespace characters, with the whitespace set of Python's str.split()
+PY_WHITESPACE = "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+WORD_RUNS = f"[^{PY_WHITESPACE}]+"
+
+BACKFILL_SQL = """
+    UPDATE accounts_pitch
+    SET word_count_30s = (SELECT count(*) FROM regexp_matches(pitch_30s, %s, 'g')),
+        word_count_3min = (SELECT count(*) FROM regexp_matches(pitch_3min, %s, 'g'));
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0051_professionalsuccess_skills_demonstrated_array"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pitch",
+            name="word_count_30s",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of words in the 30-second pitch"
+            ),
+        ),
+        migrations.AddField(
+            model_name="pitch",
+            name="word_count_3min",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of words in the 3-minute pitch"
+            ),
+        ),
+        migrations.RunSQL(sql=[(BACKFILL_SQL, [WORD_RUNS, WORD_RUNS])], reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,117 @@
+# Move ChatConversation.context_snapshot to the content-addressed ContextSnapshot table
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from accounts.models import ContextSnapshot
+
+BATCH_SIZE = 1000
+
+# Backfilled snapshots keep the creation date of their first conversation
+SNAPSHOT_DATES_SQL = """
+    UPDATE accounts_contextsnapshot AS snapshot
+    SET created_at = conversation.first_created_at
+    FROM (
+        SELECT context_snapshot_ref_id, min(created_at) AS first_created_at
+        FROM accounts_chatconversation
+        WHERE context_snapshot_ref_id IS NOT NULL
+        GROUP BY context_snapshot_ref_id
+    ) AS conversation
+    WHERE snapshot.sha256 = conversation.context_snapshot_ref_id;
+"""
+
+SNAPSHOT_TO_JSON_SQL = """
+    UPDATE accounts_chatconversation AS conversation
+    SET context_snapshot = snapshot.payload
+    FROM accounts_contextsnapshot AS snapshot
+    WHERE snapshot.sha256 = conversation.context_snapshot_ref_id;
+"""
+
+
+def json_to_snapshot(apps, schema_editor):
+    # Keys come from ContextSnapshot.digest(), so backfilled rows are shared with the
+    # snapshots ContextSnapshot.for_payload() stores for identical contexts afterwards.
+    ChatConversation = apps.get_model("accounts", "ChatConversation")
+    Snapshot = apps.get_model("accounts", "ContextSnapshot")
+    conversations = ChatConversation.objects.exclude(context_snapshot={}).only("context_snapshot").order_by("pk")
+    batch = []
+    for conversation in conversations.iterator(chunk_size=BATCH_SIZE):
+        if not conversation.context_snapshot:
+            continue
+        conversation.context_snapshot_ref_id = ContextSnapshot.digest(conversation.context_snapshot)
+        batch.append(conversation)
+        if len(batch) == BATCH_SIZE:
+            _save_batch(Snapshot, ChatConversation, batch)
+            batch = []
+    if batch:
+        _save_batch(Snapshot, ChatConversation, batch)
+    schema_editor.execute(SNAPSHOT_DATES_SQL)
+
+
+def _save_batch(Snapshot, ChatConversation, conversations):
+    payloads = {conversation.context_snapshot_ref_id: conversation.context_snapshot for conversation in conversations}
+    Snapshot.objects.bulk_create(
+        [Snapshot(sha256=sha256, payload=payload) for sha256, payload in payloads.items()],
+        ignore_conflicts=True,
+    )
+    ChatConversation.objects.bulk_update(conversations, ["context_snapshot_ref"])
+
+
+def snapshot_to_json(apps, schema_editor):
+    schema_editor.execute(SNAPSHOT_TO_JSON_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0052_pitch_word_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContextSnapshot",
+            fields=[
+                ("sha256", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("payload", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Contexte chat",
+                "verbose_name_plural": "Contextes chat",
+            },
+        ),
+        migrations.AddField(
+            model_name="chatconversation",
+            name="context_snapshot_ref",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="accounts.contextsnapshot",
+            ),
+        ),
+        migrations.RunPython(json_to_snapshot, snapshot_to_json),
+        migrations.RemoveField(
+            model_name="chatconversation",
+            name="context_snapshot",
+        ),
+        migrations.RenameField(
+            model_name="chatconversation",
+            old_name="context_snapshot_ref",
+            new_name="context_snapshot",
+        ),
+        migrations.AlterField(
+            model_name="chatconversation",
+            name="context_snapshot",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="Snapshot of user context at conversation start (profile, experiences, etc.)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="accounts.contextsnapshot",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 12:15
+
+from django.db import migrations
+
+import accounts.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0053_context_snapshot"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chatmessage",
+            name="extracted_data",
+            field=accounts.fields.OrjsonJSONField(default=dict, help_text="STAR elements detected in this message"),
+        ),
+        migrations.AlterField(
+            model_name="contextsnapshot",
+            name="payload",
+            field=accounts.fields.OrjsonJSONField(),
+        ),
+    ]
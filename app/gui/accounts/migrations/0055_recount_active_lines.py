@@ -0,0 +1,64 @@
+# Recompute path for the trigger-maintained User.active_lines_count counter.
+#
+# accounts_user_keep_active_lines_count (0020/0037) discards every direct write to the
+# counters, so a drifted value (trigger disabled during a restore, COPY, manual fix...)
+# could not be corrected. accounts_recount_active_lines() recounts from accounts_extractedline
+# and sets the transaction-local accounts.recount_active_lines GUC, which the keep trigger
+# honours. Called by User.objects.recount_active_lines() and `manage.py recount_active_lines`.
+
+from django.db import migrations
+
+CREATE_SQL = """
+    CREATE OR REPLACE FUNCTION accounts_user_keep_active_lines_count() RETURNS trigger AS $$
+    BEGIN
+        IF pg_trigger_depth() = 1
+           AND current_setting('accounts.recount_active_lines', true) IS DISTINCT FROM 'on' THEN
+            NEW.active_lines_count := OLD.active_lines_count;
+            NEW.line_counts := OLD.line_counts;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    -- user_ids NULL recounts every user. Returns the number of user rows updated.
+    CREATE FUNCTION accounts_recount_active_lines(user_ids bigint[] DEFAULT NULL) RETURNS integer AS $$
+    DECLARE
+        updated integer;
+    BEGIN
+        PERFORM set_config('accounts.recount_active_lines', 'on', true);
+        UPDATE accounts_user u SET active_lines_count = (
+            SELECT COUNT(*) FROM accounts_extractedline el
+            WHERE el.user_id = u.id AND el.is_active
+        )
+        WHERE user_ids IS NULL OR u.id = ANY(user_ids);
+        GET DIAGNOSTICS updated = ROW_COUNT;
+        PERFORM set_config('accounts.recount_active_lines', 'off', true);
+        RETURN updated;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Definition from migration 0037
+DROP_SQL = """
+    DROP FUNCTION IF EXISTS accounts_recount_active_lines(bigint[]);
+
+    CREATE OR REPLACE FUNCTION accounts_user_keep_active_lines_count() RETURNS trigger AS $$
+    BEGIN
+        IF pg_trigger_depth() = 1 THEN
+            NEW.active_lines_count := OLD.active_lines_count;
+            NEW.line_counts := OLD.line_counts;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0054_chat_json_orjson"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_SQL, reverse_sql=DROP_SQL),
+    ]
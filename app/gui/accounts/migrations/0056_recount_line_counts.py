@@ -0,0 +1,63 @@
+# accounts_recount_active_lines() (0055) also rebuilds User.line_counts, which the keep trigger
+# protects the same way as active_lines_count (0037).
+
+from django.db import migrations
+
+CREATE_SQL = """
+    CREATE OR REPLACE FUNCTION accounts_recount_active_lines(user_ids bigint[] DEFAULT NULL) RETURNS integer AS $$
+    DECLARE
+        updated integer;
+    BEGIN
+        PERFORM set_config('accounts.recount_active_lines', 'on', true);
+        UPDATE accounts_user u SET
+            active_lines_count = (
+                SELECT COUNT(*) FROM accounts_extractedline el
+                WHERE el.user_id = u.id AND el.is_active
+            ),
+            line_counts = COALESCE(
+                (
+                    SELECT jsonb_object_agg(el.content_type::text, el.n)
+                    FROM (
+                        SELECT content_type, COUNT(*) AS n FROM accounts_extractedline
+                        WHERE user_id = u.id AND is_active
+                        GROUP BY content_type
+                    ) el
+                ),
+                '{}'::jsonb
+            )
+        WHERE user_ids IS NULL OR u.id = ANY(user_ids);
+        GET DIAGNOSTICS updated = ROW_COUNT;
+        PERFORM set_config('accounts.recount_active_lines', 'off', true);
+        RETURN updated;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+# Definition from migration 0055
+RESTORE_SQL = """
+    CREATE OR REPLACE FUNCTION accounts_recount_active_lines(user_ids bigint[] DEFAULT NULL) RETURNS integer AS $$
+    DECLARE
+        updated integer;
+    BEGIN
+        PERFORM set_config('accounts.recount_active_lines', 'on', true);
+        UPDATE accounts_user u SET active_lines_count = (
+            SELECT COUNT(*) FROM accounts_extractedline el
+            WHERE el.user_id = u.id AND el.is_active
+        )
+        WHERE user_ids IS NULL OR u.id = ANY(user_ids);
+        GET DIAGNOSTICS updated = ROW_COUNT;
+        PERFORM set_config('accounts.recount_active_lines', 'off', true);
+        RETURN updated;
+    END;
+    $$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0055_recount_active_lines"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CREATE_SQL, reverse_sql=RESTORE_SQL),
+    ]
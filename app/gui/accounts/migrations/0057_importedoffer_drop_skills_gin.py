@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:09
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0056_recount_line_counts"),
+    ]
+
+    operations = [
+        # Skill filters go through skill_set; nothing queries the skills JSON by containment
+        RemoveIndexConcurrently(
+            model_name="importedoffer",
+            name="io_skills_gin",
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:10
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0057_importedoffer_drop_skills_gin"),
+    ]
+
+    operations = [
+        # Both lead with user_id like the (user, content_type, order, -created_at) index,
+        # which serves every per-user read on its own
+        RemoveIndexConcurrently(
+            model_name="extractedline",
+            name="el_active_user_ctype_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="extractedline",
+            name="exline_user_active_ctype",
+        ),
+    ]
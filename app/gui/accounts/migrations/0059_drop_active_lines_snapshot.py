@@ -0,0 +1,46 @@
+# Drop the mv_user_active_lines materialized view (ActiveLinesSnapshot): nothing refreshed or read it,
+# so it only went stale after migration 0032 filled it
+
+from django.db import migrations
+
+DROP_VIEW_SQL = "DROP MATERIALIZED VIEW IF EXISTS mv_user_active_lines;"
+
+# Definition from migration 0032
+CREATE_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW mv_user_active_lines AS
+    SELECT
+        user_id,
+        content_type,
+        jsonb_agg(
+            jsonb_build_object(
+                'id', id,
+                'content', content,
+                'entity', entity,
+                'dates', dates,
+                'position', position,
+                'description', description
+            )
+            ORDER BY "order", created_at DESC
+        ) AS lines
+    FROM accounts_extractedline
+    WHERE is_active
+    GROUP BY user_id, content_type;
+
+    CREATE UNIQUE INDEX mv_user_active_lines_pk ON mv_user_active_lines (user_id, content_type);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0058_extractedline_drop_overlapping_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=DROP_VIEW_SQL,
+            reverse_sql=CREATE_VIEW_SQL,
+            state_operations=[
+                migrations.DeleteModel(name="ActiveLinesSnapshot"),
+            ],
+        ),
+    ]
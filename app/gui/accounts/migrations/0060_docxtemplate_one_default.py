@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:26
+
+from django.db import migrations, models
+
+# Keep the most recently updated default template before enforcing uniqueness
+DEMOTE_EXTRA_DEFAULTS = """
+UPDATE accounts_docxtemplate SET is_default = false
+WHERE is_default AND id <> (
+    SELECT id FROM accounts_docxtemplate
+    WHERE is_default
+    ORDER BY updated_at DESC, id DESC
+    LIMIT 1
+);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0059_drop_active_lines_snapshot"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=DEMOTE_EXTRA_DEFAULTS, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name="docxtemplate",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)), fields=("is_default",), name="docx_one_default"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# io_new_by_score_idx (0044) and io_user_score_desc (0047) duplicate the (user, -match_score) ordering
+# already served by io_user_status_score_idx and no query reads them: drop both.
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0060_docxtemplate_one_default"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(model_name="importedoffer", name="io_new_by_score_idx"),
+        RemoveIndexConcurrently(model_name="importedoffer", name="io_user_score_desc"),
+    ]
@@ -1,6 +1,22 @@
+import hashlib
+import json
+from contextlib import contextmanager
+from itertools import groupby
+from operator import attrgetter
+
+import orjson
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.auth.models import UserManager as BaseUserManager
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connection, models, transaction
+from django.db.models.functions import Concat, JSONObject, Left, Length, Lower, Now, Substr
+from django.db.models.lookups import GreaterThan
+from django.utils.functional import cached_property
+
+from .fields import HexColorField, OrjsonJSONField, SmallIntChoiceField
 
 # Choices for CV extraction status
 EXTRACTION_STATUS_CHOICES = [
@@ -72,6 +88,7 @@ SOCIAL_LINK_TYPE_CHOICES = [
     ("medium", "Medium"),
     ("other", "Autre"),
 ]
+_LINK_TYPE_DISPLAY = dict(SOCIAL_LINK_TYPE_CHOICES)
 
 # Choices for ExtractedLine content type
 CONTENT_TYPE_CHOICES = [
@@ -87,6 +104,22 @@ CONTENT_TYPE_CHOICES = [
     ("social_link", "Lien social"),
     ("other", "Autre"),
 ]
+_CT_DISPLAY = dict(CONTENT_TYPE_CHOICES)
+# Stored smallint codes for ExtractedLine.content_type. Numbered in alphabetical
+# order of the keys so ORDER BY content_type is unchanged; never renumber.
+CONTENT_TYPE_CODES = {
+    "certification": 1,
+    "education": 2,
+    "experience": 3,
+    "interest": 4,
+    "language": 5,
+    "other": 6,
+    "personal_info": 7,
+    "skill_hard": 8,
+    "skill_soft": 9,
+    "social_link": 10,
+    "summary": 11,
+}
 
 # Choices for chat conversation status
 CONVERSATION_STATUS_CHOICES = [
@@ -101,6 +134,7 @@ MESSAGE_ROLE_CHOICES = [
     ("assistant", "Assistant"),
     ("system", "Systeme"),
 ]
+_ROLE_DISPLAY = dict(MESSAGE_ROLE_CHOICES)
 
 # Choices for chat message status
 MESSAGE_STATUS_CHOICES = [
@@ -109,6 +143,14 @@ MESSAGE_STATUS_CHOICES = [
     ("completed", "Terminee"),
     ("failed", "Echec"),
 ]
+# Stored smallint codes for ChatMessage.status, in lifecycle order; never renumber.
+MESSAGE_STATUS_CODES = {
+    "pending": 1,
+    "processing": 2,
+    "completed": 3,
+    "failed": 4,
+}
+_PENDING_MESSAGE_STATUSES = frozenset(("pending", "processing"))
 
 # Choices for coaching type
 COACHING_TYPE_CHOICES = [
@@ -117,6 +159,153 @@ COACHING_TYPE_CHOICES = [
 ]
 
 
+# Joined CV columns not shown next to a line (only the CV filename is): keeps the join narrow
+_SOURCE_CV_DEFERRED = (
+    "source_cv__file",
+    "source_cv__uploaded_at",
+    "source_cv__extraction_status",
+    "source_cv__extracted_at",
+    "source_cv__task_id",
+)
+
+
+class UserQuerySet(models.QuerySet):
+    def with_active_lines(self):
+        """
+        Prefetch each user's active extracted lines into `active_lines`.
+        get_consolidated_profile() reuses them: 2 queries for any number of users.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                "extracted_lines",
+                queryset=ExtractedLine.objects.filter(is_active=True),
+                to_attr="active_lines",
+            )
+        )
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    def get_by_natural_key(self, username):
+        # Case-insensitive login: emails are stored lowercased, the lookup stays on the unique index
+        return super().get_by_natural_key(username.lower())
+
+    def recount_active_lines(self, user_ids=None):
+        """
+        Recompute the trigger-maintained line counters from accounts_extractedline, for every
+        user or only `user_ids`. The only write to the counters the database accepts (migration 0055).
+        Returns: number of users updated
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT accounts_recount_active_lines(%s::bigint[])",
+                [None if user_ids is None else list(user_ids)],
+            )
+            return cursor.fetchone()[0]
+
+
+class ExtractedLineQuerySet(models.QuerySet):
+    def for_list(self):
+        """
+        Lines for list/summary paths that show the title and structured fields only:
+        the large (TOASTed) text columns are not fetched. display_title is stored.
+        """
+        return self.defer("content", "description")
+
+    def toggle_active(self):
+        """
+        Flip is_active on every line of the queryset in a single UPDATE.
+        Returns: number of rows updated
+        """
+        return self.update(
+            is_active=models.Case(
+                models.When(is_active=True, then=models.Value(False)),
+                default=models.Value(True),
+            ),
+            modified_at=Now(),
+        )
+
+    def mark_as_modified(self):
+        """
+        Flag every line of the queryset as edited by the user in a single UPDATE.
+        Returns: number of rows updated
+        """
+        return self.update(modified_by_user=True, modified_at=Now())
+
+
+class CVQuerySet(models.QuerySet):
+    def with_active_lines(self):
+        """
+        Prefetch each CV's active extracted lines into `active_lines`.
+        CV.get_active_lines() reuses them: 2 queries for any number of CVs.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                "extracted_lines",
+                queryset=ExtractedLine.objects.filter(is_active=True),
+                to_attr="active_lines",
+            )
+        )
+
+
+# Large ImportedOffer columns not needed to list offers
+_OFFER_LIST_DEFERRED = ("description", "salary", "skills")
+
+
+class ImportedOfferQuerySet(models.QuerySet):
+    def with_profile(self):
+        """Offers with their candidate profile fetched in the same query (single JOIN)."""
+        return self.select_related("candidate_profile")
+
+    def for_list(self):
+        """Offers for list/sidebar paths: the description and JSON columns are not fetched."""
+        return self.defer(*_OFFER_LIST_DEFERRED)
+
+
+def _document_ready(text_field, file_field):
+    """SQL flag mirroring bool(text or file) for an Application document (has_cv()/has_cover_letter())."""
+    has_file = models.Q(**{f"{file_field}__isnull": False}) & ~models.Q(**{file_field: ""})
+    return models.ExpressionWrapper(~models.Q(**{text_field: ""}) | has_file, output_field=models.BooleanField())
+
+
+class ApplicationQuerySet(models.QuerySet):
+    def with_offer(self):
+        """
+        Applications with their offer and candidate profile fetched in the same query.
+        List paths must use it: __str__, get_offer_title() and get_offer_company() read imported_offer.
+        """
+        return self.select_related("imported_offer", "candidate_profile")
+
+    def with_offer_headers(self):
+        """
+        Annotate the offer title and company only (read by get_offer_title()/get_offer_company()):
+        for lists that show no other offer field, instead of loading the offer row.
+        """
+        return self.annotate(
+            offer_title=models.F("imported_offer__title"),
+            offer_company=models.F("imported_offer__company"),
+        )
+
+    def for_list(self):
+        """
+        with_offer() for list paths (applications list): the notes, the generated documents and
+        the offer's description/JSON columns are not fetched. has_cv()/has_cover_letter() read
+        flags computed in SQL instead of the document columns.
+        """
+        return (
+            self.with_offer()
+            .annotate(
+                cv_ready=_document_ready("custom_cv", "custom_cv_file"),
+                cover_letter_ready=_document_ready("cover_letter", "cover_letter_file"),
+            )
+            .defer(
+                "notes",
+                "custom_cv",
+                "cover_letter",
+                *(f"imported_offer__{name}" for name in _OFFER_LIST_DEFERRED),
+            )
+        )
+
+
 class User(AbstractUser):
     """Custom user model for JobMatch."""
 
@@ -157,7 +346,8 @@ class User(AbstractUser):
         choices=AVAILABILITY_CHOICES,
         blank=True,
     )
-    contract_types = models.JSONField(
+    contract_types = ArrayField(
+        models.CharField(max_length=20, choices=CONTRACT_TYPE_CHOICES),
         default=list,
         blank=True,
         help_text="List of desired contract types (cdi, cdd, freelance, alternance)",
@@ -203,46 +393,157 @@ class User(AbstractUser):
         help_text="Preferred DOCX template for CV/cover letter exports",
     )
 
+    # Denormalized counter, maintained by PostgreSQL triggers on accounts_extractedline
+    # (migration 0020). Writes from the application are ignored by the database; use
+    # User.objects.recount_active_lines() (or `manage.py recount_active_lines`) to fix drift.
+    # Each inserted/toggled/deleted line updates its user row: that row is locked until commit
+    # (concurrent line writes of one user serialize) and leaves a dead user tuple behind, so
+    # bulk loads of lines pay one user UPDATE per line.
+    active_lines_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of active extracted lines (maintained by database triggers)",
+    )
+    # Same triggers (migration 0037): {content_type code (as a string): number of active lines}.
+    # Also rebuilt by User.objects.recount_active_lines() (migration 0056).
+    line_counts = models.JSONField(
+        default=dict,
+        editable=False,
+        help_text="Active extracted lines per content_type code (maintained by database triggers)",
+    )
+
+    objects = UserManager()
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
 
+    # Per-instance memo for get_consolidated_profile(), and whether it joined source_cv
+    _consolidated_profile = None
+    _consolidated_profile_has_source = False
+
     class Meta:
         verbose_name = "Utilisateur"
         verbose_name_plural = "Utilisateurs"
+        indexes = [
+            # Containment lookups, e.g. contract_types__contains=["cdi"]
+            GinIndex(fields=["contract_types"], name="user_contract_types_gin"),
+        ]
+        constraints = [
+            # Emails are stored lowercased (save()); also rejects case variants written by update()
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_ci_unique",
+                violation_error_message="Cette adresse email est déjà utilisée.",
+            ),
+        ]
 
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        if self.email:
+            self.email = self.email.lower()
+        super().save(*args, **kwargs)
+
     # Methods for consolidated profile (used by matching service)
-    def get_consolidated_profile(self):
+    def get_consolidated_profile(self, include_source=False):
         """
         Return all active extracted lines, grouped by content_type.
         Used for matching and consolidated profile display.
+        Pass include_source=True when line.source_cv is read (joined in the same query);
+        the CV filename alone is available as line.source_cv_filename.
+        The result is memoized on this instance (i.e. for the request when called
+        on request.user) until invalidate_consolidated_profile() is called.
         Returns: dict {content_type: [ExtractedLine, ...]}
         """
-        lines = self.extracted_lines.filter(is_active=True).select_related("source_cv")
-        result = {}
-        for line in lines:
-            if line.content_type not in result:
-                result[line.content_type] = []
-            result[line.content_type].append(line)
+        if self._consolidated_profile is not None and (self._consolidated_profile_has_source or not include_source):
+            return self._consolidated_profile
+
+        # Default ordering starts with content_type (served by the ordering index),
+        # so rows arrive already grouped. Reuse UserQuerySet.with_active_lines() when prefetched.
+        if hasattr(self, "active_lines") and not include_source:
+            lines = self.active_lines
+        else:
+            lines = self.extracted_lines.filter(is_active=True)
+            if include_source:
+                lines = lines.select_related("source_cv").defer(*_SOURCE_CV_DEFERRED)
+        result = {content_type: list(group) for content_type, group in groupby(lines, key=attrgetter("content_type"))}
+        self._consolidated_profile = result
+        self._consolidated_profile_has_source = include_source
         return result
 
+    def invalidate_consolidated_profile(self, counts_changed=True):
+        """
+        Drop the memoized consolidated profile. Called when an extracted line changes.
+        When lines were toggled, added or removed (counts_changed), also reload the
+        trigger-maintained counters (one query): the triggers only update the database row.
+        """
+        self._consolidated_profile = None
+        if counts_changed:
+            self.refresh_from_db(fields=["active_lines_count", "line_counts"])
+
+    def get_consolidated_profile_data(self):
+        """
+        Return all active extracted lines as plain data, grouped by content_type.
+        Grouping and serialization are done by PostgreSQL in a single query
+        (one JSON array per content_type), no ExtractedLine instance is built.
+        Used to build the AI assistant and CV/cover letter generation contexts, which only
+        need the text fields.
+        Returns: dict {content_type: [{"id", "content", "entity", "dates", "position", "description"}, ...]}
+        """
+        rows = (
+            self.extracted_lines.filter(is_active=True)
+            .order_by()
+            .values("content_type")
+            .annotate(
+                lines=JSONBAgg(
+                    JSONObject(
+                        id="id",
+                        content="content",
+                        entity="entity",
+                        dates="dates",
+                        position="position",
+                        description="description",
+                    ),
+                    order_by=("order", "-created_at"),
+                )
+            )
+        )
+        return {row["content_type"]: row["lines"] for row in rows}
+
     def get_lines_by_cv(self, cv_id):
         """
         Return all extracted lines from a specific CV.
         Used for display by source.
         Returns: QuerySet[ExtractedLine]
         """
-        return self.extracted_lines.filter(source_cv_id=cv_id)
+        # line.user is already set by the related manager; source_cv is joined once
+        return self.extracted_lines.filter(source_cv_id=cv_id).select_related("source_cv")
 
     def get_active_lines_count(self):
         """
         Return the count of active lines.
         Used for profile completion indicators.
+        Counts the memoized consolidated profile when it is loaded (no query); otherwise
+        reads the trigger-maintained counter loaded with this instance, which
+        invalidate_consolidated_profile() reloads after a toggle made through it.
         Returns: int
         """
-        return self.extracted_lines.filter(is_active=True).count()
+        if self._consolidated_profile is not None:
+            return sum(map(len, self._consolidated_profile.values()))
+        return self.active_lines_count
+
+    def get_counts_by_type(self):
+        """
+        Return the number of active lines per content_type (header badges).
+        Reads the trigger-maintained line_counts column loaded with this instance (no query);
+        reuses the memoized consolidated profile when it is already loaded.
+        Returns: dict {content_type: int}
+        """
+        if self._consolidated_profile is not None:
+            return {content_type: len(lines) for content_type, lines in self._consolidated_profile.items()}
+        keys_by_code = ExtractedLine._meta.get_field("content_type").keys_by_code
+        return {keys_by_code.get(int(code), code): n for code, n in self.line_counts.items() if n}
 
 
 class SocialLink(models.Model):
@@ -266,7 +567,7 @@ class SocialLink(models.Model):
         ordering = ["order", "link_type"]
 
     def __str__(self):
-        return f"{self.get_link_type_display()}: {self.url}"
+        return f"{_LINK_TYPE_DISPLAY.get(self.link_type, self.link_type)}: {self.url}"
 
 
 class CV(models.Model):
@@ -288,6 +589,8 @@ class CV(models.Model):
     extracted_at = models.DateTimeField(null=True, blank=True)
     task_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
 
+    objects = CVQuerySet.as_manager()
+
     class Meta:
         verbose_name = "CV"
         verbose_name_plural = "CVs"
@@ -296,12 +599,31 @@ class CV(models.Model):
     def __str__(self):
         return f"{self.original_filename} ({self.user.email})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored filename so save() only syncs the lines when it changes
+        instance._loaded_original_filename = instance.__dict__.get("original_filename")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        loaded = getattr(self, "_loaded_original_filename", None)
+        if loaded is not None and loaded != self.original_filename:
+            self.extracted_lines.update(source_cv_filename=self.original_filename)
+        self._loaded_original_filename = self.original_filename
+
     def get_extracted_lines(self):
         """Return all lines extracted from this CV."""
         return self.extracted_lines.all()
 
     def get_active_lines(self):
-        """Return only active lines from this CV."""
+        """
+        Return only active lines from this CV.
+        Uses the lines prefetched by CV.objects.with_active_lines() when present (no query).
+        """
+        if hasattr(self, "active_lines"):
+            return self.active_lines
         return self.extracted_lines.filter(is_active=True)
 
 
@@ -327,6 +649,11 @@ class CoverLetter(models.Model):
         return f"{self.title or self.original_filename} ({self.user.email})"
 
 
+# update_fields for ExtractedLine single-row writes (shared, not rebuilt per save)
+_TOGGLE_FIELDS = ("is_active", "modified_at")
+_MARK_FIELDS = ("modified_by_user", "modified_at")
+
+
 class ExtractedLine(models.Model):
     """
     Central model. Each line represents a unit of information extracted from a CV.
@@ -342,21 +669,23 @@ class ExtractedLine(models.Model):
     - social_link: 1 link = 1 line (link_type, url)
     """
 
+    # No standalone FK indexes: user_id and source_cv_id lead composite indexes (Meta.indexes)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="extracted_lines",
+        db_index=False,
     )
     source_cv = models.ForeignKey(
         CV,
         on_delete=models.CASCADE,
         related_name="extracted_lines",
+        db_index=False,
     )
-    content_type = models.CharField(
-        max_length=20,
+    content_type = SmallIntChoiceField(
         choices=CONTENT_TYPE_CHOICES,
-        db_index=True,
-    )
+        codes=CONTENT_TYPE_CODES,
+    )  # No standalone index: every content_type lookup is scoped by user or source_cv (indexes below)
     content = models.TextField()
 
     # Structured fields for experience/education
@@ -428,44 +757,106 @@ class ExtractedLine(models.Model):
         help_text="URL of the social link",
     )
 
+    # get_display_title() value, computed by PostgreSQL on every write (also QuerySet.update())
+    display_title = models.GeneratedField(
+        expression=models.Case(
+            models.When(~models.Q(position=""), position__isnull=False, then="position"),
+            models.When(
+                GreaterThan(Length("content"), 50),
+                then=Concat(Left("content", 50), models.Value("...")),
+            ),
+            default="content",
+            output_field=models.CharField(max_length=255),
+        ),
+        output_field=models.CharField(max_length=255),
+        db_persist=True,
+        help_text="Display title (position, or truncated content)",
+    )
+    # Copy of source_cv.original_filename (display without joining the CV), kept in sync by CV.save()
+    source_cv_filename = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Original filename of the source CV",
+    )
+    # Precomputed "has entity or position" flag, refreshed in save()
+    is_structured = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Line has structured data (entity or position)",
+    )
+
     is_active = models.BooleanField(default=True)
     order = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
     modified_by_user = models.BooleanField(default=False)
 
+    objects = ExtractedLineQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Ligne extraite"
         verbose_name_plural = "Lignes extraites"
         ordering = ["content_type", "order", "-created_at"]
         indexes = [
-            models.Index(fields=["user", "content_type"]),
-            models.Index(fields=["user", "is_active"]),
-            models.Index(fields=["source_cv"]),
+            # Matches the default ordering: per-user/per-type reads need no sort step. The single
+            # index for per-user reads (also the user FK index); is_active is filtered on its rows,
+            # a user has few lines and the active counts are trigger-maintained columns
+            models.Index(fields=["user", "content_type", "order", "-created_at"]),
+            # Lines of one CV in display order (also covers source_cv-only lookups)
+            models.Index(fields=["source_cv", "content_type", "order", "-created_at"], name="el_cv_ctype_order"),
+            # Structured lines only (experience/education matching)
+            models.Index(fields=["user"], condition=models.Q(is_structured=True), name="el_structured_idx"),
         ]
 
     def __str__(self):
-        return f"{self.get_content_type_display()}: {self.content[:50]}..."
+        return f"{_CT_DISPLAY.get(self.content_type, self.content_type)}: {self.content[:50]}..."
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.source_cv_filename and ExtractedLine.source_cv.is_cached(self):
+            self.source_cv_filename = self.source_cv.original_filename
+        self.is_structured = self.entity is not None or self.position is not None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"entity", "position"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "is_structured"}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        # INSERT returns display_title; an UPDATE does not (Django < 6.0), so expire the stale value
+        # and let the next access reload it (one query, only if it is actually read).
+        if not adding and (update_fields is None or {"position", "content"} & set(update_fields)):
+            self.__dict__.pop("display_title", None)
 
     def toggle_active(self):
         """Toggle the is_active status."""
         self.is_active = not self.is_active
-        self.save(update_fields=["is_active", "modified_at"])
+        self.save(update_fields=_TOGGLE_FIELDS)
+        self._invalidate_user_profile()
+
+    @classmethod
+    def bulk_toggle(cls, user, ids):
+        """
+        Toggle is_active on several lines of `user` in a single UPDATE (ids of other users
+        are ignored) and drop the user's consolidated profile memo.
+        Returns: number of rows updated
+        """
+        updated = cls.objects.filter(user=user, pk__in=ids).toggle_active()
+        user.invalidate_consolidated_profile()
+        return updated
 
     def mark_as_modified(self):
         """Mark the line as modified by user. Call when content is manually edited."""
         self.modified_by_user = True
-        self.save(update_fields=["modified_by_user", "modified_at"])
+        self.save(update_fields=_MARK_FIELDS)
+        self._invalidate_user_profile(counts_changed=False)
 
-    def is_structured(self):
-        """Check if this line has structured data (experience/education)."""
-        return self.entity is not None or self.position is not None
+    def _invalidate_user_profile(self, counts_changed=True):
+        """Invalidate the consolidated profile memo of the loaded user, if any."""
+        if ExtractedLine.user.is_cached(self):
+            self.user.invalidate_consolidated_profile(counts_changed=counts_changed)
 
     def get_display_title(self):
         """Get a display title for the line (position for experience/education, content for others)."""
-        if self.position:
-            return self.position
-        return self.content[:50] + "..." if len(self.content) > 50 else self.content
+        return self.display_title
 
     def get_display_subtitle(self):
         """Get a display subtitle (entity + dates for experience/education)."""
@@ -533,8 +924,17 @@ class UserLLMConfig(models.Model):
     def __str__(self):
         return f"LLM Config for {self.user.email}"
 
-    def get_config_dict(self):
-        """Return config as dict for cv-ingestion service."""
+    def save(self, *args, **kwargs):
+        self.__dict__.pop("config_dict", None)
+        self.__dict__.pop("request_config", None)
+        super().save(*args, **kwargs)
+
+    @cached_property
+    def config_dict(self):
+        """
+        Config as dict for cv-ingestion service (None when disabled).
+        Built once per instance and reset on save(); callers must not mutate it.
+        """
         if not self.is_enabled:
             return None
         return {
@@ -545,6 +945,41 @@ class UserLLMConfig(models.Model):
             "max_tokens": self.llm_max_tokens,
         }
 
+    def get_config_dict(self):
+        """Return config as dict for cv-ingestion service."""
+        return self.config_dict
+
+    @cached_property
+    def request_config(self):
+        """
+        Config as llm_* fields sent with cv-ingestion and ai-assistant requests
+        (None when disabled or without endpoint). Built once per instance and reset on save().
+        """
+        if not (self.is_enabled and self.llm_endpoint):
+            return None
+        return {
+            "llm_endpoint": self.llm_endpoint,
+            "llm_model": self.llm_model,
+            "llm_api_key": self.llm_api_key,
+            "llm_api_mode": self.llm_api_mode,
+            "llm_max_tokens": self.llm_max_tokens,
+        }
+
+
+@contextmanager
+def _async_commit():
+    """
+    Transaction whose COMMIT does not wait for the WAL flush (SET LOCAL synchronous_commit).
+    For UI state writes only: a server crash may lose the last changes, never corrupt them.
+    Inside an enclosing transaction it is a plain savepoint, the outer commit stays durable.
+    """
+    relax = not connection.in_atomic_block
+    with transaction.atomic():
+        if relax:
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL synchronous_commit = OFF")
+        yield
+
 
 class CandidateProfile(models.Model):
     """
@@ -580,58 +1015,195 @@ class CandidateProfile(models.Model):
             models.UniqueConstraint(
                 fields=["user", "title"],
                 name="unique_profile_title_per_user",
-            )
+            ),
+            # Also serves the "default profile of this user" lookup
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(is_default=True),
+                name="cp_one_default_per_user",
+            ),
         ]
 
+    # Per-instance caches for get_selection_map() and get_selected_lines_grouped()
+    _selection_map = None
+    _selected_lines_grouped = None
+
     def __str__(self):
         return f"{self.title} ({self.user.email})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored default flag so save() can skip the reset when it is unchanged
+        instance._loaded_is_default = instance.__dict__.get("is_default")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or "is_default" in fields:
+            self._loaded_is_default = self.is_default
+
     def save(self, *args, **kwargs):
-        # Ensure only one default profile per user
-        if self.is_default:
-            CandidateProfile.objects.filter(user=self.user, is_default=True).exclude(pk=self.pk).update(
-                is_default=False
-            )
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        writes_default = update_fields is None or "is_default" in update_fields
+        # Only one default profile per user (cp_one_default_per_user): demote the
+        # previous one in the same transaction, only when becoming the default
+        if writes_default and self.is_default and not getattr(self, "_loaded_is_default", False):
+            with transaction.atomic():
+                CandidateProfile.objects.filter(user_id=self.user_id, is_default=True).exclude(pk=self.pk).update(
+                    is_default=False
+                )
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        if writes_default:
+            self._loaded_is_default = self.is_default
 
     def get_selected_lines(self):
-        """Return all ExtractedLines selected for this profile."""
-        selected_ids = self.item_selections.filter(is_selected=True).values_list("extracted_line_id", flat=True)
-        return ExtractedLine.objects.filter(id__in=selected_ids)
+        """Return all ExtractedLines selected for this profile (single INNER JOIN on selections)."""
+        return ExtractedLine.objects.filter(
+            profile_selections__profile=self,
+            profile_selections__is_selected=True,
+        )
 
     def get_selected_lines_by_type(self, content_type):
         """Return selected ExtractedLines of a specific type."""
-        selected_ids = self.item_selections.filter(
-            is_selected=True,
-            extracted_line__content_type=content_type,
-        ).values_list("extracted_line_id", flat=True)
-        return ExtractedLine.objects.filter(id__in=selected_ids)
+        return ExtractedLine.objects.filter(
+            content_type=content_type,
+            profile_selections__profile=self,
+            profile_selections__is_selected=True,
+        )
+
+    def get_selected_lines_grouped(self, *content_types):
+        """
+        Return selected ExtractedLines of several types in one query, grouped by type
+        (instead of one get_selected_lines_by_type() query per type).
+        Cached on the instance per set of types until the selections change.
+        Returns: dict {content_type: [ExtractedLine, ...]} (types without lines are absent)
+        """
+        if self._selected_lines_grouped is None:
+            self._selected_lines_grouped = {}
+        key = frozenset(content_types)
+        if key not in self._selected_lines_grouped:
+            lines = self.get_selected_lines().filter(content_type__in=content_types)
+            # Default ordering starts with content_type: rows arrive grouped
+            self._selected_lines_grouped[key] = {
+                content_type: list(group) for content_type, group in groupby(lines, key=attrgetter("content_type"))
+            }
+        return self._selected_lines_grouped[key]
+
+    def get_selection_map(self):
+        """
+        Return the selection status of every line that has a selection row, in one query.
+        Lines missing from the map are considered selected.
+        The map is cached on the instance and used by is_line_selected().
+        Returns: dict {extracted_line_id: is_selected}
+        """
+        if self._selection_map is None:
+            self._selection_map = dict(self.item_selections.values_list("extracted_line_id", "is_selected"))
+        return self._selection_map
+
+    def prime_selections(self):
+        """
+        (Re)load the selection map in one query, so that is_line_selected() runs
+        without queries. Call once before iterating over lines.
+        """
+        self._selection_map = None
+        self.get_selection_map()
 
     def is_line_selected(self, extracted_line_id):
         """Check if a specific line is selected in this profile."""
-        selection = self.item_selections.filter(extracted_line_id=extracted_line_id).first()
-        # If no selection exists, default to True (selected)
-        return selection.is_selected if selection else True
+        if self._selection_map is not None:
+            # If no selection exists, default to True (selected)
+            return self._selection_map.get(extracted_line_id, True)
+        # One-off probe: fetch the flag column only
+        is_selected = (
+            self.item_selections.filter(extracted_line_id=extracted_line_id)
+            .values_list("is_selected", flat=True)
+            .first()
+        )
+        return True if is_selected is None else is_selected
 
     def set_line_selection(self, extracted_line_id, is_selected):
-        """Set selection status for a specific line."""
-        selection, created = self.item_selections.get_or_create(
-            extracted_line_id=extracted_line_id,
-            defaults={"is_selected": is_selected},
-        )
-        if not created and selection.is_selected != is_selected:
-            selection.is_selected = is_selected
-            selection.save(update_fields=["is_selected"])
+        """Set selection status for a specific line (single INSERT ... ON CONFLICT DO UPDATE)."""
+        with _async_commit():
+            (selection,) = ProfileItemSelection.objects.bulk_create(
+                [ProfileItemSelection(profile=self, extracted_line_id=extracted_line_id, is_selected=is_selected)],
+                update_conflicts=True,
+                unique_fields=["profile", "extracted_line"],
+                update_fields=["is_selected"],
+            )
+        self._selection_map = None
+        self._selected_lines_grouped = None
         return selection
 
+    def toggle_line_selection(self, extracted_line_id):
+        """
+        Flip the selection status of one of the user's lines in a single statement
+        (INSERT ... ON CONFLICT DO UPDATE SET is_selected = NOT is_selected).
+        A missing selection counts as selected, so the first toggle stores False.
+        Returns: the new is_selected value, or None if the line is not one of the user's
+        """
+        table = ProfileItemSelection._meta.db_table
+        with _async_commit(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (profile_id, extracted_line_id, is_selected)
+                SELECT %s, id, false FROM {ExtractedLine._meta.db_table}
+                WHERE id = %s AND user_id = %s
+                ON CONFLICT (profile_id, extracted_line_id) DO UPDATE SET is_selected = NOT {table}.is_selected
+                RETURNING is_selected
+                """,
+                [self.pk, extracted_line_id, self.user_id],
+            )
+            row = cursor.fetchone()
+        self._selection_map = None
+        self._selected_lines_grouped = None
+        return row[0] if row else None
+
+    def bulk_set_selections(self, updates):
+        """
+        Set the selection status of several lines at once (e.g. deselect all skills).
+        Existing and missing selections are written by the same INSERT ... ON CONFLICT DO UPDATE.
+        updates: dict {extracted_line_id: is_selected}
+        """
+        if not updates:
+            return
+        with _async_commit():
+            ProfileItemSelection.objects.bulk_create(
+                [
+                    ProfileItemSelection(profile=self, extracted_line_id=line_id, is_selected=is_selected)
+                    for line_id, is_selected in updates.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["profile", "extracted_line"],
+                update_fields=["is_selected"],
+                batch_size=1000,
+            )
+        self._selection_map = None
+        self._selected_lines_grouped = None
+
     def initialize_all_selected(self):
-        """Initialize all user's extracted lines as selected for this profile."""
-        lines = ExtractedLine.objects.filter(user=self.user, is_active=True)
-        for line in lines:
-            self.item_selections.get_or_create(
-                extracted_line=line,
-                defaults={"is_selected": True},
+        """
+        Initialize all user's extracted lines as selected for this profile.
+        Single INSERT ... SELECT: line ids never leave the database.
+        Existing selections are left untouched (unique_selection_per_profile_line).
+        Returns: number of selections created
+        """
+        with _async_commit(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {ProfileItemSelection._meta.db_table} (profile_id, extracted_line_id, is_selected)
+                SELECT %s, id, true FROM {ExtractedLine._meta.db_table}
+                WHERE user_id = %s AND is_active
+                ON CONFLICT (profile_id, extracted_line_id) DO NOTHING
+                """,
+                [self.pk, self.user_id],
             )
+            created = cursor.rowcount
+        self._selection_map = None
+        self._selected_lines_grouped = None
+        return created
 
     @classmethod
     def get_or_create_default(cls, user):
@@ -685,6 +1257,42 @@ class ProfileItemSelection(models.Model):
         return f"{self.profile.title}: {self.extracted_line.content[:30]}... ({status})"
 
 
+class ContextSnapshot(models.Model):
+    """
+    User context sent to the AI assistant, stored once per distinct content
+    (content-addressed by the SHA-256 of its canonical JSON). Conversations started
+    from an unchanged profile share the same row instead of each storing a copy.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    payload = OrjsonJSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Contexte chat"
+        verbose_name_plural = "Contextes chat"
+
+    def __str__(self):
+        return self.sha256[:12]
+
+    @staticmethod
+    def digest(payload):
+        """SHA-256 of the canonical JSON form of `payload` (orjson: sorted keys, compact, UTF-8)."""
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    @classmethod
+    def for_payload(cls, payload):
+        """
+        Return the snapshot holding `payload`, storing it if it is new.
+        Single INSERT ... ON CONFLICT DO NOTHING: no lookup round trip, safe under concurrency.
+        Returns: ContextSnapshot, or None for an empty payload
+        """
+        if not payload:
+            return None
+        (snapshot,) = cls.objects.bulk_create([cls(sha256=cls.digest(payload), payload=payload)], ignore_conflicts=True)
+        return snapshot
+
+
 class ChatConversation(models.Model):
     """
     Chat conversation for AI-assisted coaching.
@@ -712,8 +1320,14 @@ class ChatConversation(models.Model):
         choices=CONVERSATION_STATUS_CHOICES,
         default="active",
     )
-    context_snapshot = models.JSONField(
-        default=dict,
+    # Shared content-addressed row; no index, snapshots are never looked up by conversation
+    context_snapshot = models.ForeignKey(
+        ContextSnapshot,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        db_index=False,
         help_text="Snapshot of user context at conversation start (profile, experiences, etc.)",
     )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -727,14 +1341,43 @@ class ChatConversation(models.Model):
     def __str__(self):
         return f"Conversation {self.id} - {self.user.email} ({self.status})"
 
+    def get_context(self):
+        """
+        Return the user context captured at conversation start ({} if none).
+        Load the conversation with select_related("context_snapshot") to avoid a query.
+        """
+        return self.context_snapshot.payload if self.context_snapshot_id else {}
+
     def get_messages(self):
         """Return all messages in this conversation ordered by creation time."""
         return self.messages.all().order_by("created_at")
 
+    def get_recent_messages(self, limit=50):
+        """
+        Return the last `limit` messages in creation order.
+        Backward scan of the (conversation, created_at) index: older messages are never read.
+        Returns: list[ChatMessage]
+        """
+        messages = list(self.messages.order_by("-created_at")[:limit])
+        messages.reverse()
+        return messages
+
     def get_last_message(self):
         """Return the last message in the conversation."""
+        # Backward scan of the (conversation, created_at) index, LIMIT 1: no sort
         return self.messages.order_by("-created_at").first()
 
+    def get_last_message_status(self):
+        """
+        Return the last message without its content and extracted_data (status polling).
+        Same index scan as get_last_message().
+        """
+        return (
+            self.messages.order_by("-created_at")
+            .only("id", "conversation_id", "status", "task_id", "created_at")
+            .first()
+        )
+
     def add_user_message(self, content):
         """Add a user message to the conversation."""
         return ChatMessage.objects.create(
@@ -744,6 +1387,18 @@ class ChatConversation(models.Model):
             status="completed",
         )
 
+    def bulk_add_messages(self, messages):
+        """
+        Add several messages to the conversation in a single INSERT (e.g. a user
+        message and its pending assistant reply, or a replayed transcript).
+        messages: list of dicts of ChatMessage field values (role, content, status, ...)
+        Returns: list[ChatMessage] with their ids set, in the given order
+        """
+        return ChatMessage.objects.bulk_create(
+            [ChatMessage(conversation=self, **message) for message in messages],
+            batch_size=500,
+        )
+
     def add_assistant_message(self, content, task_id=None, status="completed"):
         """Add an assistant message to the conversation."""
         return ChatMessage.objects.create(
@@ -765,15 +1420,16 @@ class ChatMessage(models.Model):
         ChatConversation,
         on_delete=models.CASCADE,
         related_name="messages",
+        db_index=False,  # (conversation, created_at) index below serves conversation lookups
     )
     role = models.CharField(
         max_length=20,
         choices=MESSAGE_ROLE_CHOICES,
     )
     content = models.TextField()
-    status = models.CharField(
-        max_length=20,
+    status = SmallIntChoiceField(
         choices=MESSAGE_STATUS_CHOICES,
+        codes=MESSAGE_STATUS_CODES,
         default="completed",
     )
     task_id = models.CharField(
@@ -783,7 +1439,7 @@ class ChatMessage(models.Model):
         db_index=True,
         help_text="Task ID for async processing polling",
     )
-    extracted_data = models.JSONField(
+    extracted_data = OrjsonJSONField(
         default=dict,
         help_text="STAR elements detected in this message",
     )
@@ -793,16 +1449,21 @@ class ChatMessage(models.Model):
         verbose_name = "Message chat"
         verbose_name_plural = "Messages chat"
         ordering = ["created_at"]
+        get_latest_by = "created_at"
         indexes = [
             models.Index(fields=["conversation", "created_at"]),
         ]
 
     def __str__(self):
-        return f"{self.get_role_display()}: {self.content[:50]}..."
+        return f"{_ROLE_DISPLAY.get(self.role, self.role)}: {self.content[:50]}..."
 
     def is_pending(self):
         """Check if message is still being processed."""
-        return self.status in ("pending", "processing")
+        return self.status in _PENDING_MESSAGE_STATUSES
+
+
+_STAR_FIELDS = ("situation", "task", "action", "result")
+_STAR_SUMMARY_LENGTH = 200
 
 
 class ProfessionalSuccess(models.Model):
@@ -838,7 +1499,8 @@ class ProfessionalSuccess(models.Model):
         help_text="R - Results: What were the measurable outcomes?",
     )
     # Metadata
-    skills_demonstrated = models.JSONField(
+    skills_demonstrated = ArrayField(
+        models.CharField(max_length=100),
         default=list,
         help_text="List of skills demonstrated in this success",
     )
@@ -858,6 +1520,12 @@ class ProfessionalSuccess(models.Model):
         default=True,
         help_text="Whether this success is included in the candidate profile",
     )
+    # Number of non-blank STAR components, refreshed in save()
+    filled_steps = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of filled STAR components (0-4)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -870,24 +1538,55 @@ class ProfessionalSuccess(models.Model):
         status = "brouillon" if self.is_draft else "finalise"
         return f"{self.title} ({status})"
 
+    def save(self, *args, **kwargs):
+        self.filled_steps = sum(1 for field in _STAR_FIELDS if (text := getattr(self, field)) and text.strip())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(_STAR_FIELDS) & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "filled_steps"}
+        super().save(*args, **kwargs)
+
     def is_complete(self):
         """Check if all STAR components are filled."""
         return all([self.situation, self.task, self.action, self.result])
 
     def get_completion_percentage(self):
-        """Calculate STAR completion percentage."""
-        fields = [self.situation, self.task, self.action, self.result]
-        filled = sum(1 for f in fields if f.strip())
-        return int((filled / 4) * 100)
+        """Calculate STAR completion percentage (from the stored filled_steps)."""
+        return self.filled_steps * 25
+
+    @classmethod
+    def get_list_summary(cls, queryset):
+        """
+        Annotate `<field>_prefix` (first characters of each STAR component) and defer
+        the full texts, for list views that only call get_star_summary().
+        Returns: QuerySet[ProfessionalSuccess]
+        """
+        return queryset.defer(*_STAR_FIELDS).annotate(
+            **{f"{field}_prefix": Substr(field, 1, _STAR_SUMMARY_LENGTH + 1) for field in _STAR_FIELDS}
+        )
 
     def get_star_summary(self):
         """Get a formatted STAR summary for display."""
-        return {
-            "situation": self.situation[:200] + "..." if len(self.situation) > 200 else self.situation,
-            "task": self.task[:200] + "..." if len(self.task) > 200 else self.task,
-            "action": self.action[:200] + "..." if len(self.action) > 200 else self.action,
-            "result": self.result[:200] + "..." if len(self.result) > 200 else self.result,
-        }
+        summary = {}
+        for field in _STAR_FIELDS:
+            # Prefix annotated by get_list_summary(), so the deferred full text is not loaded
+            text = getattr(self, f"{field}_prefix", None)
+            if text is None:
+                text = getattr(self, field)
+            summary[field] = text[:_STAR_SUMMARY_LENGTH] + "..." if len(text) > _STAR_SUMMARY_LENGTH else text
+        return summary
+
+
+def _count_words(text):
+    """
+    Number of whitespace-separated words in `text`.
+    str.split() runs in C and beats iterator-based regex scans (finditer/findall) by 4-6x on
+    pitch-sized text despite building the list, so it stays the counting primitive.
+    """
+    return len(text.split()) if text else 0
+
+
+# Pitch text field -> stored word count column (Pitch.save())
+_PITCH_WORD_COUNT_FIELDS = {"pitch_30s": "word_count_30s", "pitch_3min": "word_count_3min"}
 
 
 class Pitch(models.Model):
@@ -916,10 +1615,23 @@ class Pitch(models.Model):
         help_text="3-minute detailed pitch (~400-450 words)",
     )
     # Key strengths highlighted in the pitch
-    key_strengths = models.JSONField(
+    key_strengths = ArrayField(
+        models.CharField(max_length=100),
+        size=5,
         default=list,
         help_text="List of 3-5 key strengths highlighted in this pitch",
     )
+    # Whitespace-separated word counts of pitch_30s / pitch_3min, refreshed in save()
+    word_count_30s = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of words in the 30-second pitch",
+    )
+    word_count_3min = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of words in the 3-minute pitch",
+    )
     # Target context for this pitch
     target_context = models.CharField(
         max_length=255,
@@ -950,39 +1662,92 @@ class Pitch(models.Model):
         verbose_name = "Pitch"
         verbose_name_plural = "Pitches"
         ordering = ["-is_default", "-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(is_default=True),
+                name="pitch_one_default_per_user",
+            ),
+        ]
 
     def __str__(self):
         status = "brouillon" if self.is_draft else "finalise"
         title = self.title or f"Pitch #{self.id}"
         return f"{title} ({status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored default flag so save() can skip the reset when it is unchanged
+        instance._loaded_is_default = instance.__dict__.get("is_default")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or "is_default" in fields:
+            self._loaded_is_default = self.is_default
+
     def save(self, *args, **kwargs):
-        # Ensure only one default pitch per user
-        if self.is_default:
-            Pitch.objects.filter(user=self.user, is_default=True).exclude(pk=self.pk).update(is_default=False)
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        # Recount only the pitch texts being written (deferred texts are unchanged)
+        deferred = self.get_deferred_fields()
+        counted = [
+            field
+            for field in _PITCH_WORD_COUNT_FIELDS
+            if field not in deferred and (update_fields is None or field in update_fields)
+        ]
+        for field in counted:
+            setattr(self, _PITCH_WORD_COUNT_FIELDS[field], _count_words(getattr(self, field)))
+        if update_fields is not None and counted:
+            kwargs["update_fields"] = {*update_fields, *(_PITCH_WORD_COUNT_FIELDS[field] for field in counted)}
+        writes_default = update_fields is None or "is_default" in update_fields
+        # Only one default pitch per user (pitch_one_default_per_user): demote the
+        # previous one in the same transaction, only when becoming the default
+        if writes_default and self.is_default and not getattr(self, "_loaded_is_default", False):
+            with transaction.atomic():
+                Pitch.objects.filter(user_id=self.user_id, is_default=True).exclude(pk=self.pk).update(is_default=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        if writes_default:
+            self._loaded_is_default = self.is_default
 
     def is_complete(self):
-        """Check if both pitch formats are filled."""
-        return bool(self.pitch_30s and self.pitch_3min)
+        """Check if both pitch formats are filled (from the stored word counts)."""
+        return self.word_count_30s > 0 and self.word_count_3min > 0
 
     def get_word_count_30s(self):
-        """Get word count for 30s pitch (target: 75-80 words)."""
-        return len(self.pitch_30s.split()) if self.pitch_30s else 0
+        """Get word count for 30s pitch (target: 75-80 words), as of the last save()."""
+        return self.word_count_30s
 
     def get_word_count_3min(self):
-        """Get word count for 3min pitch (target: 400-450 words)."""
-        return len(self.pitch_3min.split()) if self.pitch_3min else 0
+        """Get word count for 3min pitch (target: 400-450 words), as of the last save()."""
+        return self.word_count_3min
 
     def get_completion_percentage(self):
-        """Calculate pitch completion percentage."""
-        filled = sum(
-            [
-                1 if self.pitch_30s else 0,
-                1 if self.pitch_3min else 0,
-            ]
-        )
-        return int((filled / 2) * 100)
+        """Calculate pitch completion percentage (from the stored word counts)."""
+        return ((self.word_count_30s > 0) + (self.word_count_3min > 0)) * 50
+
+
+class Skill(models.Model):
+    """
+    Skill name shared by imported offers (normalized: stripped, lowercase).
+    Mirrors ImportedOffer.skills as an indexed many-to-many for filtering and aggregation.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        verbose_name = "Competence"
+        verbose_name_plural = "Competences"
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def normalize(name):
+        return name.strip().lower()[:255]
 
 
 # Choices for imported offer status
@@ -995,6 +1760,22 @@ IMPORTED_OFFER_STATUS_CHOICES = [
 ]
 
 
+# Captured content refreshed when an offer is imported again (ImportedOffer.bulk_ingest)
+_INGEST_UPDATE_FIELDS = (
+    "source_domain",
+    "captured_at",
+    "title",
+    "company",
+    "location",
+    "description",
+    "contract_type",
+    "remote_type",
+    "salary",
+    "skills",
+    "updated_at",
+)
+
+
 class ImportedOffer(models.Model):
     """
     Job offer captured by browser extension.
@@ -1052,6 +1833,9 @@ class ImportedOffer(models.Model):
         default=list,
         help_text="List of skills mentioned in the offer",
     )
+    # Normalized copy of `skills` for filtering, rebuilt by save() and bulk_ingest() through
+    # sync_skills(); QuerySet.update(skills=...) bypasses both and must call sync_skills()
+    skill_set = models.ManyToManyField(Skill, related_name="offers", blank=True)
 
     # Matching results
     # TODO: Integrate with matching service to compute match_score
@@ -1077,6 +1861,8 @@ class ImportedOffer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ImportedOfferQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Offre importee"
         verbose_name_plural = "Offres importees"
@@ -1088,7 +1874,8 @@ class ImportedOffer(models.Model):
             )
         ]
         indexes = [
-            models.Index(fields=["user", "status"]),
+            # "new offers above score X for this user"; (user, status) is its prefix
+            models.Index(fields=["user", "status", "-match_score"], name="io_user_status_score_idx"),
             models.Index(fields=["user", "-captured_at"]),
             models.Index(fields=["source_domain"]),
         ]
@@ -1096,12 +1883,87 @@ class ImportedOffer(models.Model):
     def __str__(self):
         return f"{self.title} - {self.company or 'Unknown'} ({self.source_domain})"
 
-    def get_salary_display(self):
-        """Return formatted salary string."""
+    @classmethod
+    def bulk_ingest(cls, user, rows, candidate_profile=None, batch_size=10_000):
+        """
+        Insert or refresh many captured offers for `user` in batched INSERT ... ON CONFLICT
+        (user, source_url) DO UPDATE statements instead of one round-trip per offer.
+        `rows` are dicts of ImportedOffer field values; status, match results and the profile
+        of offers that already exist are kept.
+        Returns: the stored offers, in `rows` order, reloaded after the upsert (one more SELECT)
+        so offers that already existed carry their kept values, not the constructor defaults
+        """
+        offers = [cls(user=user, candidate_profile=candidate_profile, **row) for row in rows]
+        with transaction.atomic():
+            offers = cls.objects.bulk_create(
+                offers,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["user", "source_url"],
+                update_fields=_INGEST_UPDATE_FIELDS,
+            )
+            cls.sync_skills(offers)
+            stored = cls.objects.in_bulk([offer.pk for offer in offers])
+        return [stored[offer.pk] for offer in offers]
+
+    @classmethod
+    def sync_skills(cls, offers):
+        """
+        Rebuild the skill_set links of saved `offers` from their `skills` JSON list:
+        missing Skill rows and the links are bulk-inserted (one transaction of 4 queries for any
+        number of offers).
+        """
+        names_by_offer = {
+            offer.pk: {Skill.normalize(name) for name in offer.skills or [] if isinstance(name, str)}
+            for offer in offers
+        }
+        names = set().union(*names_by_offer.values())
+        through = cls.skill_set.through
+        with transaction.atomic():
+            Skill.objects.bulk_create([Skill(name=name) for name in names if name], ignore_conflicts=True)
+            skill_ids = dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+            through.objects.filter(importedoffer_id__in=names_by_offer).delete()
+            through.objects.bulk_create(
+                [
+                    through(importedoffer_id=offer_id, skill_id=skill_ids[name])
+                    for offer_id, offer_names in names_by_offer.items()
+                    for name in offer_names
+                    if name in skill_ids
+                ],
+                ignore_conflicts=True,
+            )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored skills so save() only rebuilds skill_set when they change
+        instance._loaded_skills = instance.__dict__.get("skills")
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop("salary_display", None)
+        update_fields = kwargs.get("update_fields")
+        writes_skills = "skills" in self.__dict__ and (update_fields is None or "skills" in update_fields)
+        if writes_skills and self.skills != getattr(self, "_loaded_skills", []):
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                ImportedOffer.sync_skills([self])
+            self._loaded_skills = self.skills
+        else:
+            super().save(*args, **kwargs)
+
+    @cached_property
+    def salary_display(self):
+        """
+        Formatted salary string (None when no amount is known).
+        Built once per instance and reset on save().
+        """
         if not self.salary:
             return None
         min_sal = self.salary.get("min")
         max_sal = self.salary.get("max")
+        if not (min_sal or max_sal):
+            return None
         currency = self.salary.get("currency", "EUR")
         period = self.salary.get("period", "year")
 
@@ -1109,9 +1971,11 @@ class ImportedOffer(models.Model):
             return f"{min_sal:,} - {max_sal:,} {currency}/{period}"
         elif min_sal:
             return f"From {min_sal:,} {currency}/{period}"
-        elif max_sal:
-            return f"Up to {max_sal:,} {currency}/{period}"
-        return None
+        return f"Up to {max_sal:,} {currency}/{period}"
+
+    def get_salary_display(self):
+        """Return formatted salary string."""
+        return self.salary_display
 
     def get_match_score_percentage(self):
         """Return match score as percentage (0-100)."""
@@ -1129,16 +1993,17 @@ APPLICATION_STATUS_CHOICES = [
     ("accepted", "Acceptee"),
     ("rejected", "Refusee"),
 ]
+_APPLICATION_STATUS_DISPLAY = dict(APPLICATION_STATUS_CHOICES)
 
 
 def application_cv_path(instance, filename):
     """Generate path for custom CV files."""
-    return f"applications/{instance.user.id}/{instance.id}/cv_{filename}"
+    return f"applications/{instance.user_id}/{instance.id}/cv_{filename}"
 
 
 def application_cover_letter_path(instance, filename):
     """Generate path for cover letter files."""
-    return f"applications/{instance.user.id}/{instance.id}/cover_letter_{filename}"
+    return f"applications/{instance.user_id}/{instance.id}/cover_letter_{filename}"
 
 
 class Application(models.Model):
@@ -1215,19 +2080,12 @@ class Application(models.Model):
         help_text="Personal notes about this application",
     )
 
-    # History of events (JSON array)
-    # Format: [{"date": "ISO datetime", "event": "event_type", "details": "..."}]
-    # Event types: created, cv_generated, cover_letter_generated, applied,
-    #              interview_scheduled, status_changed, note_added
-    history = models.JSONField(
-        default=list,
-        help_text="Timeline of events for this application",
-    )
-
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ApplicationQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Candidature"
         verbose_name_plural = "Candidatures"
@@ -1244,57 +2102,136 @@ class Application(models.Model):
         ]
 
     def __str__(self):
-        offer_title = self.imported_offer.title if self.imported_offer else "Unknown"
-        return f"Application: {offer_title} ({self.get_status_display()})"
+        offer_title = self.get_offer_title() or "Unknown"
+        return f"Application: {offer_title} ({_APPLICATION_STATUS_DISPLAY.get(self.status, self.status)})"
 
     def add_history_event(self, event_type, details=""):
-        """Add an event to the history timeline."""
-        from django.utils import timezone
+        """Add an event to the history timeline (single INSERT into ApplicationEvent)."""
+        return ApplicationEvent.objects.create(application=self, event_type=event_type, details=details)
 
-        event = {
-            "date": timezone.now().isoformat(),
-            "event": event_type,
-            "details": details,
-        }
-        self.history.append(event)
+    def record_event(self, event_type, details="", **changes):
+        """
+        Add an event to the history timeline and write `changes` (field=value) with an UPDATE,
+        in one transaction. The instance is updated in memory as well.
+        """
+        with transaction.atomic():
+            Application.objects.filter(pk=self.pk).update(updated_at=Now(), **changes)
+            self.add_history_event(event_type, details)
+        for name, value in changes.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def bulk_create_for_offers(cls, user, offers, candidate_profile=None):
+        """
+        Create the applications (with their "created" event) of the `offers` that have none yet:
+        two SELECTs and two bulk INSERTs for any number of offers.
+        The offer rows are locked (in id order) before looking for existing applications, so
+        concurrent calls for the same offers run one after the other instead of both inserting
+        and failing on unique_application_per_user_offer.
+        Returns: the created applications
+        """
+        offer_ids = [offer.pk for offer in offers]
+        with transaction.atomic():
+            list(ImportedOffer.objects.select_for_update().filter(pk__in=offer_ids).order_by("pk").values_list("pk"))
+            existing = set(
+                cls.objects.filter(user=user, imported_offer__in=offer_ids).values_list("imported_offer_id", flat=True)
+            )
+            applications = cls.objects.bulk_create(
+                [
+                    cls(user=user, imported_offer=offer, candidate_profile=candidate_profile)
+                    for offer in offers
+                    if offer.pk not in existing
+                ]
+            )
+            ApplicationEvent.objects.bulk_create(
+                [
+                    ApplicationEvent(application=application, event_type="created", details="Application created")
+                    for application in applications
+                ]
+            )
+        return applications
 
     def save(self, *args, **kwargs):
         """Override save to add created event on first save."""
-        is_new = self.pk is None
-        super().save(*args, **kwargs)
-        if is_new and not self.history:
+        if self.pk is not None:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
             self.add_history_event("created", "Application created")
-            super().save(update_fields=["history"])
 
     def get_offer_title(self):
-        """Return the title of the linked offer."""
+        """Return the title of the linked offer (annotation from with_offer_headers() when present)."""
+        if hasattr(self, "offer_title"):
+            return self.offer_title
         if self.imported_offer:
             return self.imported_offer.title
         return None
 
     def get_offer_company(self):
-        """Return the company of the linked offer."""
+        """Return the company of the linked offer (annotation from with_offer_headers() when present)."""
+        if hasattr(self, "offer_company"):
+            return self.offer_company
         if self.imported_offer:
             return self.imported_offer.company
         return None
 
     def has_cv(self):
-        """Check if a custom CV has been created."""
+        """Check if a custom CV has been created (cv_ready annotation from for_list() when present)."""
+        if hasattr(self, "cv_ready"):
+            return self.cv_ready
         return bool(self.custom_cv or self.custom_cv_file)
 
     def has_cover_letter(self):
-        """Check if a cover letter has been created."""
+        """Check if a cover letter has been created (cover_letter_ready annotation from for_list() when present)."""
+        if hasattr(self, "cover_letter_ready"):
+            return self.cover_letter_ready
         return bool(self.cover_letter or self.cover_letter_file)
 
     def get_completion_status(self):
         """Return completion status of application documents."""
+        has_cv = self.has_cv()
+        has_cover_letter = self.has_cover_letter()
         return {
-            "cv": self.has_cv(),
-            "cover_letter": self.has_cover_letter(),
-            "complete": self.has_cv() and self.has_cover_letter(),
+            "cv": has_cv,
+            "cover_letter": has_cover_letter,
+            "complete": has_cv and has_cover_letter,
         }
 
 
+class ApplicationEvent(models.Model):
+    """
+    Event of an application timeline (one row per event).
+    Event types: created, cv_generated, cover_letter_generated, applied,
+    interview_scheduled, status_changed, note_added, ...
+    """
+
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name="events",
+        db_index=False,  # (application, -created_at) index below serves application lookups
+    )
+    event_type = models.CharField(max_length=32)
+    details = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Evenement de candidature"
+        verbose_name_plural = "Evenements de candidature"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["application", "-created_at"], name="appevent_app_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.created_at})"
+
+
+# (template pk, updated_at) -> to_js_config() JSON, shared by every request of the process
+_DOCX_JS_CONFIG_CACHE = {}
+_DOCX_JS_CONFIG_CACHE_SIZE = 256
+
+
 class DocxTemplate(models.Model):
     """DOCX template configuration for CV and cover letter exports."""
 
@@ -1328,8 +2265,7 @@ class DocxTemplate(models.Model):
     )
 
     # Color settings
-    accent_color = models.CharField(
-        max_length=7,
+    accent_color = HexColorField(
         default="#667eea",
         help_text="Accent color for section titles (hex format, e.g., '#667eea')",
     )
@@ -1379,15 +2315,52 @@ class DocxTemplate(models.Model):
         verbose_name = "Template DOCX"
         verbose_name_plural = "Templates DOCX"
         ordering = ["-is_default", "name"]
+        constraints = [
+            # accent_color is a packed 24-bit int, so "valid hex" is a range check
+            models.CheckConstraint(condition=models.Q(accent_color__lte=0xFFFFFF), name="docx_accent_hex_valid"),
+            *(
+                models.CheckConstraint(
+                    condition=models.Q(**{f"margin_{side}__lte": 5670}),  # 10cm
+                    name=f"docx_margin_{side}_range",
+                )
+                for side in ("top", "right", "bottom", "left")
+            ),
+            # At most one default template
+            models.UniqueConstraint(
+                fields=["is_default"],
+                condition=models.Q(is_default=True),
+                name="docx_one_default",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored default flag so save() can skip the reset when it is unchanged
+        instance._loaded_is_default = instance.__dict__.get("is_default")
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None or "is_default" in fields:
+            self._loaded_is_default = self.is_default
+
     def save(self, *args, **kwargs):
-        """Ensure only one default template exists."""
-        if self.is_default:
-            DocxTemplate.objects.filter(is_default=True).exclude(pk=self.pk).update(is_default=False)
-        super().save(*args, **kwargs)
+        """Ensure only one default template exists (only reset when becoming the default)."""
+        update_fields = kwargs.get("update_fields")
+        writes_default = update_fields is None or "is_default" in update_fields
+        # docx_one_default: demote the previous default in the same transaction
+        if writes_default and self.is_default and not getattr(self, "_loaded_is_default", False):
+            with transaction.atomic():
+                DocxTemplate.objects.filter(is_default=True).exclude(pk=self.pk).update(is_default=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        if writes_default:
+            self._loaded_is_default = self.is_default
 
     def to_js_config(self):
         """Return template configuration as a dict for JavaScript/docx.js."""
@@ -1404,3 +2377,16 @@ class DocxTemplate(models.Model):
             "lineSpacing": self.line_spacing,
             "paragraphSpacingAfter": self.paragraph_spacing_after,
         }
+
+    def to_js_config_json(self):
+        """
+        to_js_config() serialized for templates, built once per process and template version:
+        updated_at changes on every save(), so an edited template gets a new cache entry.
+        """
+        key = (self.pk, self.updated_at)
+        config = _DOCX_JS_CONFIG_CACHE.get(key)
+        if config is None:
+            if len(_DOCX_JS_CONFIG_CACHE) >= _DOCX_JS_CONFIG_CACHE_SIZE:
+                _DOCX_JS_CONFIG_CACHE.clear()
+            config = _DOCX_JS_CONFIG_CACHE[key] = json.dumps(self.to_js_config())
+        return config
@@ -1 +1,499 @@
 # Tests for accounts app
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Value
+from django.db.models.expressions import DatabaseDefault
+from django.db.models.functions import JSONObject
+from django.test import TestCase
+from django.utils import timezone
+
+from .fields import OrjsonJSONField
+from .forms import AccountEmailForm, UserRegistrationForm
+from .models import (
+    CONTENT_TYPE_CODES,
+    CV,
+    Application,
+    ApplicationEvent,
+    CandidateProfile,
+    ChatConversation,
+    ChatMessage,
+    ContextSnapshot,
+    DocxTemplate,
+    ExtractedLine,
+    ImportedOffer,
+    ProfileItemSelection,
+    User,
+)
+
+
+def make_user(email="candidate@example.com"):
+    """Create a user with one uploaded CV."""
+    user = User.objects.create_user(username=email, email=email, password="secret")
+    cv = CV.objects.create(user=user, file="cvs/cv.pdf", original_filename="cv.pdf")
+    return user, cv
+
+
+def add_line(user, cv, content_type="skill_hard", **kwargs):
+    return ExtractedLine.objects.create(user=user, source_cv=cv, content_type=content_type, content="Python", **kwargs)
+
+
+def fetch_column(model, column, pk):
+    """Read the raw stored value of a column, bypassing the field's from_db_value()."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {column} FROM {model._meta.db_table} WHERE id = %s", [pk])
+        return cursor.fetchone()[0]
+
+
+class ExtractedLineDisplayTitleTests(TestCase):
+    def setUp(self):
+        self.user, self.cv = make_user()
+
+    def test_display_title_on_create(self):
+        line = ExtractedLine.objects.create(
+            user=self.user, source_cv=self.cv, content_type="experience", content="x" * 60, position="Dev"
+        )
+        self.assertEqual(line.display_title, "Dev")
+        self.assertEqual(line.get_display_title(), "Dev")
+
+    def test_display_title_truncates_content(self):
+        line = ExtractedLine.objects.create(
+            user=self.user, source_cv=self.cv, content_type="skill_hard", content="x" * 60
+        )
+        self.assertEqual(line.display_title, "x" * 50 + "...")
+
+    def test_display_title_refreshed_after_update(self):
+        line = ExtractedLine.objects.create(
+            user=self.user, source_cv=self.cv, content_type="experience", content="Backend work", position="Dev"
+        )
+        line.position = "Lead"
+        line.save()
+        self.assertEqual(line.display_title, "Lead")
+
+        line.position = ""
+        line.save(update_fields=["position"])
+        self.assertEqual(line.display_title, "Backend work")
+
+    def test_display_title_kept_when_unrelated_fields_saved(self):
+        line = ExtractedLine.objects.create(
+            user=self.user, source_cv=self.cv, content_type="experience", content="Backend work", position="Dev"
+        )
+        line = ExtractedLine.objects.get(pk=line.pk)
+        with self.assertNumQueries(1):
+            line.toggle_active()
+            self.assertEqual(line.display_title, "Dev")
+
+
+class CustomFieldRoundTripTests(TestCase):
+    def setUp(self):
+        self.user, self.cv = make_user()
+
+    def test_hex_color_field(self):
+        template = DocxTemplate.objects.create(name="Modern", accent_color="#1A2b3C")
+        self.assertEqual(fetch_column(DocxTemplate, "accent_color", template.pk), 0x1A2B3C)
+        template.refresh_from_db()
+        self.assertEqual(template.accent_color, "#1a2b3c")
+        self.assertTrue(DocxTemplate.objects.filter(accent_color="#1a2b3c").exists())
+
+    def test_hex_color_field_rejects_invalid_value(self):
+        template = DocxTemplate(name="Broken", accent_color="#12345")
+        with self.assertRaises(Exception) as ctx:
+            template.full_clean()
+        self.assertIn("accent_color", ctx.exception.message_dict)
+
+    def test_small_int_choice_field(self):
+        line = add_line(self.user, self.cv, "education")
+        self.assertEqual(fetch_column(ExtractedLine, "content_type", line.pk), CONTENT_TYPE_CODES["education"])
+        line.refresh_from_db()
+        self.assertEqual(line.content_type, "education")
+        self.assertEqual(ExtractedLine.objects.get(content_type="education"), line)
+        self.assertEqual(list(ExtractedLine.objects.values_list("content_type", flat=True)), ["education"])
+
+    def test_small_int_choice_field_rejects_unknown_key(self):
+        with self.assertRaises(ValueError):
+            ExtractedLine.objects.filter(content_type="unknown").exists()
+
+    def test_orjson_json_field(self):
+        conversation = ChatConversation.objects.create(user=self.user)
+        data = {"situation": "Équipe de 5", "actions": ["a", "b"], "score": 1.5, "done": True, "extra": None}
+        message = ChatMessage.objects.create(
+            conversation=conversation, role="assistant", content="ok", extracted_data=data
+        )
+        message.refresh_from_db()
+        self.assertEqual(message.extracted_data, data)
+        self.assertEqual(ChatMessage.objects.get(extracted_data__situation="Équipe de 5"), message)
+        self.assertEqual(
+            ChatMessage.objects.values_list("extracted_data__actions", flat=True).get(),
+            ["a", "b"],
+        )
+
+    def test_orjson_json_field_expressions(self):
+        conversation = ChatConversation.objects.create(user=self.user)
+        message = ChatMessage.objects.create(conversation=conversation, role="assistant", content="ok")
+        self.assertEqual(message.extracted_data, {})
+
+        ChatMessage.objects.filter(pk=message.pk).update(extracted_data=Value({"result": "ok"}, OrjsonJSONField()))
+        message.refresh_from_db()
+        self.assertEqual(message.extracted_data, {"result": "ok"})
+
+        # Built by the database, not adapted as a Python value
+        ChatMessage.objects.filter(pk=message.pk).update(extracted_data=JSONObject(reply=F("content")))
+        message.refresh_from_db()
+        self.assertEqual(message.extracted_data, {"reply": "ok"})
+
+        field = ChatMessage._meta.get_field("extracted_data")
+        db_default = DatabaseDefault(Value({}), output_field=field)
+        self.assertIs(field.get_db_prep_value(db_default, connection), db_default)
+        self.assertIs(field.get_db_prep_save(db_default, connection), db_default)
+
+
+class ActiveLinesCounterTests(TestCase):
+    def setUp(self):
+        self.user, self.cv = make_user()
+
+    def stored_count(self):
+        return User.objects.values_list("active_lines_count", flat=True).get(pk=self.user.pk)
+
+    def test_counter_follows_insert_toggle_and_delete(self):
+        line = add_line(self.user, self.cv)
+        add_line(self.user, self.cv, is_active=False)
+        self.assertEqual(self.stored_count(), 1)
+        line.toggle_active()
+        self.assertEqual(self.stored_count(), 0)
+        ExtractedLine.bulk_toggle(self.user, ExtractedLine.objects.values_list("pk", flat=True))
+        self.assertEqual(self.stored_count(), 2)
+        ExtractedLine.objects.filter(user=self.user).delete()
+        self.assertEqual(self.stored_count(), 0)
+
+    def test_loaded_user_counts_follow_toggles(self):
+        line = add_line(self.user, self.cv)
+        other = add_line(self.user, self.cv, "experience")
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.get_active_lines_count(), 2)
+
+        line.user = user
+        line.toggle_active()
+        self.assertEqual(user.get_active_lines_count(), 1)
+        self.assertEqual(user.get_counts_by_type(), {"experience": 1})
+
+        ExtractedLine.bulk_toggle(user, [line.pk, other.pk])
+        self.assertEqual(user.get_active_lines_count(), 1)
+        self.assertEqual(user.get_counts_by_type(), {"skill_hard": 1})
+
+        # Content edits do not change the counts: no reload
+        with self.assertNumQueries(1):
+            line.mark_as_modified()
+
+    def test_application_writes_are_ignored(self):
+        add_line(self.user, self.cv)
+        self.user.first_name = "Ada"
+        self.user.save()  # writes the stale in-memory active_lines_count (0)
+        self.assertEqual(self.stored_count(), 1)
+        User.objects.filter(pk=self.user.pk).update(active_lines_count=42)
+        self.assertEqual(self.stored_count(), 1)
+
+    def test_recount_fixes_drift(self):
+        add_line(self.user, self.cv)
+        add_line(self.user, self.cv)
+        other, other_cv = make_user("other@example.com")
+        add_line(other, other_cv)
+        with connection.cursor() as cursor:
+            # Simulate drift (e.g. lines restored with triggers disabled) through the recount escape hatch
+            cursor.execute("SELECT set_config('accounts.recount_active_lines', 'on', true)")
+            cursor.execute("UPDATE accounts_user SET active_lines_count = 7")
+            cursor.execute("SELECT set_config('accounts.recount_active_lines', 'off', true)")
+
+        self.assertEqual(User.objects.recount_active_lines([self.user.pk]), 1)
+        self.assertEqual(self.stored_count(), 2)
+        self.assertEqual(User.objects.values_list("active_lines_count", flat=True).get(pk=other.pk), 7)
+
+        out = StringIO()
+        call_command("recount_active_lines", stdout=out)
+        self.assertIn("2 user(s)", out.getvalue())
+        self.assertEqual(User.objects.values_list("active_lines_count", flat=True).get(pk=other.pk), 1)
+
+        # The escape hatch is scoped to the recount: direct writes are ignored again
+        User.objects.filter(pk=self.user.pk).update(active_lines_count=42)
+        self.assertEqual(self.stored_count(), 2)
+
+
+class LineCountsTests(TestCase):
+    def setUp(self):
+        self.user, self.cv = make_user()
+
+    def counts(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(sum(user.get_counts_by_type().values()), user.active_lines_count)
+        return user.get_counts_by_type()
+
+    def test_counts_follow_insert_toggle_content_type_change_and_delete(self):
+        skill = add_line(self.user, self.cv, "skill_hard")
+        add_line(self.user, self.cv, "skill_hard")
+        experience = add_line(self.user, self.cv, "experience")
+        add_line(self.user, self.cv, "interest", is_active=False)
+        self.assertEqual(self.counts(), {"skill_hard": 2, "experience": 1})
+
+        skill.toggle_active()
+        self.assertEqual(self.counts(), {"skill_hard": 1, "experience": 1})
+        ExtractedLine.objects.filter(user=self.user, content_type="interest").toggle_active()
+        self.assertEqual(self.counts(), {"skill_hard": 1, "experience": 1, "interest": 1})
+
+        experience.content_type = "education"
+        experience.save()
+        self.assertEqual(self.counts(), {"skill_hard": 1, "education": 1, "interest": 1})
+        # Moving an inactive line does not count it
+        skill.content_type = "education"
+        skill.save()
+        self.assertEqual(self.counts(), {"skill_hard": 1, "education": 1, "interest": 1})
+
+        experience.delete()
+        self.assertEqual(self.counts(), {"skill_hard": 1, "interest": 1})
+        ExtractedLine.objects.filter(user=self.user).delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_recount_rebuilds_line_counts(self):
+        add_line(self.user, self.cv, "skill_hard")
+        add_line(self.user, self.cv, "experience")
+        add_line(self.user, self.cv, "experience", is_active=False)
+        User.objects.filter(pk=self.user.pk).update(line_counts={"1": 9})
+        self.assertEqual(self.counts(), {"skill_hard": 1, "experience": 1})
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('accounts.recount_active_lines', 'on', true)")
+            cursor.execute("UPDATE accounts_user SET line_counts = '{\"1\": 9}', active_lines_count = 9")
+            cursor.execute("SELECT set_config('accounts.recount_active_lines', 'off', true)")
+        User.objects.recount_active_lines([self.user.pk])
+        self.assertEqual(self.counts(), {"skill_hard": 1, "experience": 1})
+
+
+class ProfileSelectionTests(TestCase):
+    def setUp(self):
+        self.user, self.cv = make_user()
+        self.lines = [add_line(self.user, self.cv) for _ in range(3)]
+        self.inactive = add_line(self.user, self.cv, is_active=False)
+        self.profile = CandidateProfile.objects.create(user=self.user, title="Data")
+
+    def selections(self):
+        return dict(
+            ProfileItemSelection.objects.filter(profile=self.profile).values_list("extracted_line", "is_selected")
+        )
+
+    def test_toggle_line_selection(self):
+        line = self.lines[0]
+        self.assertIs(self.profile.is_line_selected(line.pk), True)
+        self.assertIs(self.profile.toggle_line_selection(line.pk), False)
+        self.assertIs(self.profile.is_line_selected(line.pk), False)
+        self.assertIs(self.profile.toggle_line_selection(line.pk), True)
+        self.assertEqual(self.selections(), {line.pk: True})
+
+    def test_toggle_line_selection_ignores_other_users_lines(self):
+        other, other_cv = make_user("other@example.com")
+        other_line = add_line(other, other_cv)
+        self.assertIsNone(self.profile.toggle_line_selection(other_line.pk))
+        self.assertEqual(self.selections(), {})
+
+    def test_initialize_all_selected(self):
+        self.profile.set_line_selection(self.lines[0].pk, False)
+        self.assertEqual(self.profile.initialize_all_selected(), 2)
+        self.assertEqual(
+            self.selections(),
+            {self.lines[0].pk: False, self.lines[1].pk: True, self.lines[2].pk: True},
+        )
+        self.assertEqual(self.profile.initialize_all_selected(), 0)
+        self.assertEqual(list(self.profile.get_selected_lines().order_by("pk")), self.lines[1:])
+
+    def test_get_or_create_default_selects_active_lines(self):
+        profile, created = CandidateProfile.get_or_create_default(self.user)
+        self.assertTrue(created)
+        self.assertEqual(ProfileItemSelection.objects.filter(profile=profile, is_selected=True).count(), 3)
+        self.assertEqual(CandidateProfile.get_or_create_default(self.user), (profile, False))
+
+
+class DefaultProfileTests(TestCase):
+    def setUp(self):
+        self.user, _ = make_user()
+
+    def default_titles(self):
+        return list(CandidateProfile.objects.filter(user=self.user, is_default=True).values_list("title", flat=True))
+
+    def test_new_default_demotes_previous_one(self):
+        first = CandidateProfile.objects.create(user=self.user, title="First", is_default=True)
+        CandidateProfile.objects.create(user=self.user, title="Second", is_default=True)
+        self.assertEqual(self.default_titles(), ["Second"])
+
+        first.refresh_from_db()
+        first.is_default = True
+        first.save()
+        self.assertEqual(self.default_titles(), ["First"])
+
+    def test_new_default_template_demotes_previous_one(self):
+        first = DocxTemplate.objects.create(name="Classic", is_default=True)
+        DocxTemplate.objects.create(name="Modern", is_default=True)
+        self.assertEqual(list(DocxTemplate.objects.filter(is_default=True).values_list("name", flat=True)), ["Modern"])
+
+        # refresh_from_db() resyncs the loaded flag, so becoming the default again demotes "Modern"
+        first.refresh_from_db()
+        first.is_default = True
+        first.save()
+        self.assertEqual(list(DocxTemplate.objects.filter(is_default=True).values_list("name", flat=True)), ["Classic"])
+
+        second = DocxTemplate.objects.get(name="Modern")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DocxTemplate.objects.filter(pk=second.pk).update(is_default=True)
+
+    def test_database_rejects_two_defaults(self):
+        CandidateProfile.objects.create(user=self.user, title="First", is_default=True)
+        second = CandidateProfile.objects.create(user=self.user, title="Second")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CandidateProfile.objects.filter(pk=second.pk).update(is_default=True)
+
+
+class ContextSnapshotTests(TestCase):
+    def test_for_payload_shares_identical_contexts(self):
+        first = ContextSnapshot.for_payload({"profile": {"name": "Ada"}, "skills": ["Python"]})
+        second = ContextSnapshot.for_payload({"skills": ["Python"], "profile": {"name": "Ada"}})
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(ContextSnapshot.objects.count(), 1)
+        self.assertEqual(ContextSnapshot.objects.get().payload, {"profile": {"name": "Ada"}, "skills": ["Python"]})
+        self.assertIsNone(ContextSnapshot.for_payload({}))
+
+
+class ImportedOfferSkillsTests(TestCase):
+    def setUp(self):
+        self.user, _ = make_user()
+
+    def create_offer(self, **kwargs):
+        return ImportedOffer.objects.create(
+            user=self.user,
+            source_url="https://example.com/jobs/1",
+            source_domain="example.com",
+            captured_at=timezone.now(),
+            title="Data engineer",
+            **kwargs,
+        )
+
+    def skill_names(self, offer):
+        return sorted(offer.skill_set.values_list("name", flat=True))
+
+    def test_skill_set_follows_skills_on_every_save(self):
+        offer = self.create_offer(skills=["Python", " SQL", "python"])
+        self.assertEqual(self.skill_names(offer), ["python", "sql"])
+
+        offer = ImportedOffer.objects.get(pk=offer.pk)
+        offer.skills = ["Spark"]
+        offer.save(update_fields=["skills"])
+        self.assertEqual(self.skill_names(offer), ["spark"])
+
+        offer.skills = []
+        offer.save()
+        self.assertEqual(self.skill_names(offer), [])
+
+    def test_save_without_skill_changes_skips_sync(self):
+        offer = ImportedOffer.objects.get(pk=self.create_offer(skills=["Python"]).pk)
+        with self.assertNumQueries(1):
+            offer.status = "viewed"
+            offer.save()
+        with self.assertNumQueries(1):
+            offer.skills = ["Go"]
+            offer.save(update_fields=["status"])
+        self.assertEqual(self.skill_names(offer), ["python"])
+
+
+class ApplicationBulkCreateTests(TestCase):
+    def setUp(self):
+        self.user, _ = make_user()
+        self.offers = [
+            ImportedOffer.objects.create(
+                user=self.user,
+                source_url=f"https://example.com/jobs/{i}",
+                source_domain="example.com",
+                captured_at=timezone.now(),
+                title=f"Job {i}",
+            )
+            for i in range(3)
+        ]
+
+    def test_creates_missing_applications_once(self):
+        Application.objects.create(user=self.user, imported_offer=self.offers[0], status="applied")
+        created = Application.bulk_create_for_offers(self.user, self.offers)
+        self.assertEqual(sorted(app.imported_offer_id for app in created), [o.pk for o in self.offers[1:]])
+        self.assertEqual(Application.objects.get(imported_offer=self.offers[0]).status, "applied")
+        self.assertEqual(ApplicationEvent.objects.filter(event_type="created").count(), 3)
+
+        self.assertEqual(Application.bulk_create_for_offers(self.user, self.offers), [])
+        self.assertEqual(Application.objects.count(), 3)
+
+    def test_database_rejects_duplicate_application(self):
+        Application.objects.create(user=self.user, imported_offer=self.offers[0])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Application.objects.bulk_create([Application(user=self.user, imported_offer=self.offers[0])])
+
+
+class ConsolidatedProfileDataTests(TestCase):
+    def test_groups_active_lines_in_display_order(self):
+        user, cv = make_user()
+        second = add_line(user, cv, "skill_hard", order=1)
+        first = add_line(user, cv, "skill_hard", order=0)
+        experience = ExtractedLine.objects.create(
+            user=user, source_cv=cv, content_type="experience", content="Backend", entity="ACME", position="Dev"
+        )
+        add_line(user, cv, "interest", is_active=False)
+
+        with self.assertNumQueries(1):
+            data = user.get_consolidated_profile_data()
+        self.assertEqual(set(data), {"skill_hard", "experience"})
+        self.assertEqual([line["id"] for line in data["skill_hard"]], [first.pk, second.pk])
+        self.assertEqual(
+            data["experience"],
+            [
+                {
+                    "id": experience.pk,
+                    "content": "Backend",
+                    "entity": "ACME",
+                    "dates": None,
+                    "position": "Dev",
+                    "description": None,
+                }
+            ],
+        )
+
+
+class EmailCaseInsensitivityTests(TestCase):
+    def setUp(self):
+        self.user, _ = make_user("Candidate@Example.com")
+
+    def test_email_stored_lowercased(self):
+        self.assertEqual(User.objects.values_list("email", flat=True).get(pk=self.user.pk), "candidate@example.com")
+
+    def test_login_ignores_email_case(self):
+        self.assertEqual(User.objects.get_by_natural_key("CANDIDATE@example.COM"), self.user)
+        self.assertEqual(authenticate(username="Candidate@EXAMPLE.com", password="secret"), self.user)
+        self.assertIsNone(authenticate(username="candidate@example.com", password="wrong"))
+
+    def test_registration_rejects_case_variant(self):
+        form = UserRegistrationForm(
+            data={
+                "email": "CANDIDATE@example.com",
+                "username": "other",
+                "password1": "Str0ng-passphrase",
+                "password2": "Str0ng-passphrase",
+            }
+        )
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["email"], ["Cette adresse email est déjà utilisée."])
+
+    def test_email_form_rejects_case_variant_of_other_account(self):
+        other, _ = make_user("other@example.com")
+        form = AccountEmailForm(data={"email": "Candidate@example.com"}, instance=other)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["email"], ["Cette adresse email est déjà utilisée."])
+
+        form = AccountEmailForm(data={"email": "CANDIDATE@example.com"}, instance=self.user)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().email, "candidate@example.com")
+
+    def test_database_rejects_case_variant(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.bulk_create([User(username="dup", email="CANDIDATE@example.com")])
@@ -1,5 +1,4 @@
 import contextlib
-import json as json_module
 import logging
 
 import requests
@@ -7,6 +6,7 @@ from django.conf import settings
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView, LogoutView
+from django.db import transaction
 from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
@@ -25,18 +25,19 @@ from .forms import (
 )
 from .models import (
     APPLICATION_STATUS_CHOICES,
+    CONTENT_TYPE_CODES,
     CV,
     SOCIAL_LINK_TYPE_CHOICES,
     Application,
     CandidateProfile,
     ChatConversation,
     ChatMessage,
+    ContextSnapshot,
     DocxTemplate,
     ExtractedLine,
     ImportedOffer,
     Pitch,
     ProfessionalSuccess,
-    ProfileItemSelection,
     SocialLink,
     User,
     UserLLMConfig,
@@ -78,45 +79,38 @@ def profile_view(request):
 
     user = request.user
 
+    # All user profiles (dropdown) in one query; current and default profiles are picked from it
+    candidate_profiles = list(user.candidate_profiles.all())
+
     # Get or create default "Complet" profile
-    default_profile, _ = CandidateProfile.get_or_create_default(user)
+    default_profile = next((p for p in candidate_profiles if p.title == "Complet"), None)
+    if default_profile is None:
+        default_profile, _ = CandidateProfile.get_or_create_default(user)
+        candidate_profiles = list(user.candidate_profiles.all())
 
     # Get current profile from session or use default
     current_profile_id = request.session.get("current_profile_id")
     if current_profile_id:
-        try:
-            current_profile = CandidateProfile.objects.get(id=current_profile_id, user=user)
-        except CandidateProfile.DoesNotExist:
+        current_profile = next((p for p in candidate_profiles if p.id == current_profile_id), None)
+        if current_profile is None:
             current_profile = default_profile
             request.session["current_profile_id"] = default_profile.id
     else:
-        current_profile = user.candidate_profiles.filter(is_default=True).first() or default_profile
+        current_profile = next((p for p in candidate_profiles if p.is_default), None) or default_profile
         request.session["current_profile_id"] = current_profile.id
 
-    # Get all user profiles for dropdown
-    candidate_profiles = user.candidate_profiles.all()
-
-    # Get extracted lines grouped by content_type for career path display
-    experiences = user.extracted_lines.filter(content_type="experience", is_active=True).order_by(
-        "order", "-created_at"
-    )
-    skills_hard = user.extracted_lines.filter(content_type="skill_hard", is_active=True).order_by(
-        "order", "-created_at"
-    )
-    skills_soft = user.extracted_lines.filter(content_type="skill_soft", is_active=True).order_by(
-        "order", "-created_at"
-    )
-    educations = user.extracted_lines.filter(content_type="education", is_active=True).order_by("order", "-created_at")
-    certifications = user.extracted_lines.filter(content_type="certification", is_active=True).order_by(
-        "order", "-created_at"
-    )
-    languages = user.extracted_lines.filter(content_type="language", is_active=True).order_by("order", "-created_at")
-    interests = user.extracted_lines.filter(content_type="interest", is_active=True).order_by("order", "-created_at")
+    # Get extracted lines grouped by content_type for career path display (single query)
+    consolidated = user.get_consolidated_profile()
+    experiences = consolidated.get("experience", [])
+    skills_hard = consolidated.get("skill_hard", [])
+    skills_soft = consolidated.get("skill_soft", [])
+    educations = consolidated.get("education", [])
+    certifications = consolidated.get("certification", [])
+    languages = consolidated.get("language", [])
+    interests = consolidated.get("interest", [])
 
-    # Build selection map for current profile
-    profile_selections = {}
-    for selection in current_profile.item_selections.all():
-        profile_selections[selection.extracted_line_id] = selection.is_selected
+    # Selection map for current profile (two columns, single query)
+    profile_selections = current_profile.get_selection_map()
 
     # Get user's CVs for documents section
     user_cvs = user.cvs.all()
@@ -176,14 +170,18 @@ def photo_upload_view(request):
             status=400,
         )
 
-    # Delete old photo if exists
-    if request.user.photo:
-        request.user.photo.delete(save=False)
+    # The browser already crops and resizes to a 400x400 JPEG, so the file is
+    # stored as-is (no Pillow decode here). The previous file is removed from
+    # storage only once the new one is committed.
+    old_photo_name = request.user.photo.name if request.user.photo else None
 
-    # Save new photo
     request.user.photo = photo
     request.user.save(update_fields=["photo"])
 
+    if old_photo_name and old_photo_name != request.user.photo.name:
+        storage = request.user.photo.storage
+        transaction.on_commit(lambda: storage.delete(old_photo_name))
+
     logger.info(f"User {request.user.id} uploaded a new profile photo")
 
     return JsonResponse(
@@ -309,20 +307,12 @@ def cv_upload_view(request):
         # Include user's custom LLM config if enabled and user has premium+ subscription
         data = {}
         user = request.user
-        if user.subscription_tier not in ("free", "basic"):
-            try:
-                llm_config = user.llm_config
-                if llm_config.is_enabled and llm_config.llm_endpoint:
-                    data["llm_endpoint"] = llm_config.llm_endpoint
-                    data["llm_model"] = llm_config.llm_model
-                    data["llm_api_key"] = llm_config.llm_api_key
-                    data["llm_api_mode"] = llm_config.llm_api_mode
-                    data["llm_max_tokens"] = llm_config.llm_max_tokens
-                    logger.info(
-                        f"Using custom LLM config for user {user.id}, mode: {llm_config.llm_api_mode}, max_tokens: {llm_config.llm_max_tokens}"
-                    )
-            except UserLLMConfig.DoesNotExist:
-                pass  # No custom config, use server defaults
+        llm_config = _get_user_llm_config(user)
+        if llm_config:
+            data.update(llm_config)
+            logger.info(
+                f"Using custom LLM config for user {user.id}, mode: {llm_config['llm_api_mode']}, max_tokens: {llm_config['llm_max_tokens']}"
+            )
 
         response = requests.post(
             cv_ingestion_url,
@@ -342,7 +332,7 @@ def cv_upload_view(request):
 
         # Store task_id in CV for polling
         cv.task_id = task_id
-        cv.save()
+        cv.save(update_fields=["task_id"])
 
         logger.info(f"CV {cv.id} submitted for async extraction, task_id: {task_id}")
 
@@ -358,19 +348,19 @@ def cv_upload_view(request):
 
     except requests.Timeout:
         cv.extraction_status = "failed"
-        cv.save()
+        cv.save(update_fields=["extraction_status"])
         logger.error(f"CV {cv.id} submission timeout")
         return JsonResponse({"success": False, "error": "Timeout lors de la soumission. Réessayez plus tard."})
 
     except requests.RequestException as e:
         cv.extraction_status = "failed"
-        cv.save()
+        cv.save(update_fields=["extraction_status"])
         logger.error(f"CV {cv.id} submission failed: {e}")
         return JsonResponse({"success": False, "error": "Erreur de communication avec le service d'extraction."})
 
     except Exception as e:
         cv.extraction_status = "failed"
-        cv.save()
+        cv.save(update_fields=["extraction_status"])
         logger.error(f"CV {cv.id} submission error: {e}")
         return JsonResponse({"success": False, "error": f"Erreur lors de la soumission : {e}"})
 
@@ -408,7 +398,7 @@ def cv_status_view(request, task_id):
 
         if response.status_code == 404:
             cv.extraction_status = "failed"
-            cv.save()
+            cv.save(update_fields=["extraction_status"])
             return JsonResponse({"success": False, "status": "failed", "error": "Tâche non trouvée."})
 
         if response.status_code != 200:
@@ -426,11 +416,16 @@ def cv_status_view(request, task_id):
             lines_created = 0
 
             for idx, line_data in enumerate(extracted_lines):
+                # Unknown types from the extraction service are stored as "other"
+                line_content_type = line_data.get("content_type")
+                if line_content_type not in CONTENT_TYPE_CODES:
+                    line_content_type = "other"
+
                 # Build line data with optional structured fields
                 line_kwargs = {
                     "user": request.user,
                     "source_cv": cv,
-                    "content_type": line_data.get("content_type", "other"),
+                    "content_type": line_content_type,
                     "content": line_data.get("content", ""),
                     "order": line_data.get("order", idx),
                 }
@@ -470,21 +465,14 @@ def cv_status_view(request, task_id):
                 content_type = line_data.get("content_type")
                 if content_type == "personal_info":
                     user = request.user
-                    updated = False
-                    if line_data.get("first_name") and not user.first_name:
-                        user.first_name = line_data["first_name"]
-                        updated = True
-                    if line_data.get("last_name") and not user.last_name:
-                        user.last_name = line_data["last_name"]
-                        updated = True
-                    if line_data.get("phone") and not user.phone:
-                        user.phone = line_data["phone"]
-                        updated = True
-                    if line_data.get("location") and not user.location:
-                        user.location = line_data["location"]
-                        updated = True
-                    if updated:
-                        user.save()
+                    updated_fields = []
+                    for field in ("first_name", "last_name", "phone", "location"):
+                        if line_data.get(field) and not getattr(user, field):
+                            setattr(user, field, line_data[field])
+                            updated_fields.append(field)
+                    if updated_fields:
+                        # Only the synced columns: the trigger-maintained line counters are stale in memory
+                        user.save(update_fields=[*updated_fields, "updated_at"])
                         logger.info(f"User {user.id} personal info updated from CV extraction")
 
                 # Create SocialLink from extracted social_link data
@@ -504,7 +492,7 @@ def cv_status_view(request, task_id):
             # Update CV status
             cv.extraction_status = "completed"
             cv.extracted_at = timezone.now()
-            cv.save()
+            cv.save(update_fields=["extraction_status", "extracted_at"])
 
             logger.info(f"CV {cv.id} extraction completed: {lines_created} lines created")
 
@@ -519,7 +507,7 @@ def cv_status_view(request, task_id):
 
         elif status == "failed":
             cv.extraction_status = "failed"
-            cv.save()
+            cv.save(update_fields=["extraction_status"])
             error_msg = result.get("error", "Erreur inconnue")
             logger.error(f"CV {cv.id} extraction failed: {error_msg}")
             return JsonResponse({"success": False, "status": "failed", "error": f"Extraction échouée: {error_msg}"})
@@ -572,7 +560,7 @@ def extracted_line_toggle_view(request, line_id):
     Toggle the is_active status of an ExtractedLine.
     """
     try:
-        line = ExtractedLine.objects.get(id=line_id, user=request.user)
+        line = request.user.extracted_lines.get(id=line_id)
     except ExtractedLine.DoesNotExist:
         return JsonResponse({"success": False, "error": "Élément non trouvé"}, status=404)
 
@@ -922,7 +910,7 @@ def profile_update_view(request, profile_id):
 
     profile.title = title
     profile.description = description
-    profile.save()
+    profile.save(update_fields=["title", "description", "updated_at"])
 
     logger.info(f"User {request.user.id} updated profile '{profile.title}'")
 
@@ -977,31 +965,18 @@ def profile_item_toggle_view(request, profile_id, line_id):
     except CandidateProfile.DoesNotExist:
         return JsonResponse({"success": False, "error": "Profil non trouvé"}, status=404)
 
-    try:
-        line = ExtractedLine.objects.get(id=line_id, user=request.user)
-    except ExtractedLine.DoesNotExist:
+    # Ownership check and toggle in one upsert (the line must belong to the profile's user)
+    is_selected = profile.toggle_line_selection(line_id)
+    if is_selected is None:
         return JsonResponse({"success": False, "error": "Élément non trouvé"}, status=404)
 
-    # Get or create selection, then toggle
-    selection, created = ProfileItemSelection.objects.get_or_create(
-        profile=profile,
-        extracted_line=line,
-        defaults={"is_selected": False},  # If creating, set to False (was True by default, now toggled)
-    )
-
-    if not created:
-        selection.is_selected = not selection.is_selected
-        selection.save()
-
-    logger.info(
-        f"User {request.user.id} toggled item {line_id} to {selection.is_selected} in profile '{profile.title}'"
-    )
+    logger.info(f"User {request.user.id} toggled item {line_id} to {is_selected} in profile '{profile.title}'")
 
     return JsonResponse(
         {
             "success": True,
-            "is_selected": selection.is_selected,
-            "message": f"Élément {'sélectionné' if selection.is_selected else 'désélectionné'}",
+            "is_selected": is_selected,
+            "message": f"Élément {'sélectionné' if is_selected else 'désélectionné'}",
         }
     )
 
@@ -1015,10 +990,8 @@ def profile_selections_view(request, profile_id):
     except CandidateProfile.DoesNotExist:
         return JsonResponse({"success": False, "error": "Profil non trouvé"}, status=404)
 
-    # Build selection map
-    selections = {}
-    for selection in profile.item_selections.all():
-        selections[selection.extracted_line_id] = selection.is_selected
+    # Selection map (two columns, single query)
+    selections = profile.get_selection_map()
 
     # For items without explicit selection, they are selected by default
     all_line_ids = list(ExtractedLine.objects.filter(user=request.user, is_active=True).values_list("id", flat=True))
@@ -1056,37 +1029,37 @@ def _build_user_context(user, coaching_type: str = "star") -> dict:
     if default_profile:
         profile_title = default_profile.title
 
+    # Active lines as plain data, grouped by content_type (one query)
+    lines = user.get_consolidated_profile_data()
+
     # Get experiences
     experiences = []
-    for exp in user.extracted_lines.filter(content_type="experience", is_active=True)[:5]:
+    for exp in lines.get("experience", [])[:5]:
         experiences.append(
             {
-                "entity": exp.entity or "",
-                "position": exp.position or "",
-                "dates": exp.dates or "",
-                "description": exp.description or "",
+                "entity": exp["entity"] or "",
+                "position": exp["position"] or "",
+                "dates": exp["dates"] or "",
+                "description": exp["description"] or "",
             }
         )
 
     # Get education (for pitch coaching)
     education = []
-    for edu in user.extracted_lines.filter(content_type="education", is_active=True)[:3]:
+    for edu in lines.get("education", [])[:3]:
         education.append(
             {
-                "entity": edu.entity or "",
-                "degree": edu.position or "",  # position stores diploma name for education
-                "dates": edu.dates or "",
+                "entity": edu["entity"] or "",
+                "degree": edu["position"] or "",  # position stores diploma name for education
+                "dates": edu["dates"] or "",
             }
         )
 
     # Get skills (both hard and soft, for pitch coaching)
-    skills = [
-        line.content
-        for line in user.extracted_lines.filter(content_type__in=["skill_hard", "skill_soft"], is_active=True)[:10]
-    ]
+    skills = [line["content"] for line in [*lines.get("skill_hard", []), *lines.get("skill_soft", [])][:10]]
 
     # Get interests
-    interests = [line.content for line in user.extracted_lines.filter(content_type="interest", is_active=True)[:5]]
+    interests = [line["content"] for line in lines.get("interest", [])[:5]]
 
     # Get existing successes
     # For pitch coaching, include full STAR data to help build the pitch
@@ -1146,18 +1119,10 @@ def _get_user_llm_config(user) -> dict | None:
     if user.subscription_tier in ("free", "basic"):
         return None
     try:
-        llm_config = user.llm_config
-        if llm_config.is_enabled and llm_config.llm_endpoint:
-            return {
-                "llm_endpoint": llm_config.llm_endpoint,
-                "llm_model": llm_config.llm_model,
-                "llm_api_key": llm_config.llm_api_key,
-                "llm_api_mode": llm_config.llm_api_mode,
-                "llm_max_tokens": llm_config.llm_max_tokens,
-            }
+        # Cached on the config instance (user.llm_config is cached on the user)
+        return user.llm_config.request_config
     except UserLLMConfig.DoesNotExist:
-        pass
-    return None
+        return None
 
 
 @login_required
@@ -1184,7 +1149,7 @@ def chat_start_view(request):
     conversation = ChatConversation.objects.create(
         user=user,
         coaching_type=coaching_type,
-        context_snapshot=context_snapshot,
+        context_snapshot=ContextSnapshot.for_payload(context_snapshot),
     )
 
     try:
@@ -1234,18 +1199,18 @@ def chat_start_view(request):
 
     except requests.Timeout:
         conversation.status = "abandoned"
-        conversation.save()
+        conversation.save(update_fields=["status", "updated_at"])
         return JsonResponse({"success": False, "error": "Timeout lors du démarrage du chat."})
 
     except requests.RequestException as e:
         conversation.status = "abandoned"
-        conversation.save()
+        conversation.save(update_fields=["status", "updated_at"])
         logger.error(f"Chat start failed: {e}")
         return JsonResponse({"success": False, "error": "Erreur de communication avec l'assistant IA."})
 
     except Exception as e:
         conversation.status = "abandoned"
-        conversation.save()
+        conversation.save(update_fields=["status", "updated_at"])
         logger.error(f"Chat start error: {e}")
         return JsonResponse({"success": False, "error": f"Erreur: {e}"})
 
@@ -1275,9 +1240,9 @@ def chat_message_view(request):
     # Save user message
     user_msg = conversation.add_user_message(message_content)
 
-    # Build history for AI
+    # Build history for AI (recent messages only, bounded payload)
     history = []
-    for msg in conversation.get_messages():
+    for msg in conversation.get_recent_messages():
         if msg.id != user_msg.id:  # Exclude the just-added message
             history.append({"role": msg.role, "content": msg.content})
 
@@ -1382,7 +1347,7 @@ def chat_status_view(request, task_id):
 
         if response.status_code == 404:
             message.status = "failed"
-            message.save()
+            message.save(update_fields=["status"])
             return JsonResponse({"success": False, "status": "failed", "error": "Tâche non trouvée."})
 
         if response.status_code != 200:
@@ -1402,7 +1367,7 @@ def chat_status_view(request, task_id):
             message.content = response_text
             message.status = "completed"
             message.extracted_data = extracted_data
-            message.save()
+            message.save(update_fields=["content", "status", "extracted_data"])
 
             logger.info(f"Chat response received for task {task_id}")
 
@@ -1418,7 +1383,7 @@ def chat_status_view(request, task_id):
         elif status == "failed":
             error_msg = result.get("error", "Erreur inconnue")
             message.status = "failed"
-            message.save()
+            message.save(update_fields=["status"])
             return JsonResponse({"success": False, "status": "failed", "error": error_msg})
 
         else:
@@ -1493,7 +1458,7 @@ def chat_start_stream_view(request):
     conversation = ChatConversation.objects.create(
         user=user,
         coaching_type=coaching_type,
-        context_snapshot=context_snapshot,
+        context_snapshot=ContextSnapshot.for_payload(context_snapshot),
     )
 
     # Create a pending ChatMessage for the assistant's response
@@ -1547,7 +1512,7 @@ def chat_start_stream_view(request):
             # Save the complete response
             assistant_message.content = "".join(full_response)
             assistant_message.status = "completed"
-            assistant_message.save()
+            assistant_message.save(update_fields=["content", "status"])
 
             logger.info(f"Streaming completed for conversation {conversation.id}")
 
@@ -1555,7 +1520,7 @@ def chat_start_stream_view(request):
             logger.error(f"Streaming failed: {e}")
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
             assistant_message.status = "failed"
-            assistant_message.save()
+            assistant_message.save(update_fields=["status"])
 
     # Return conversation_id in first event
     def wrapped_stream():
@@ -1595,34 +1560,29 @@ def chat_message_stream_view(request):
 
     # Get conversation
     try:
-        conversation = ChatConversation.objects.get(id=conversation_id, user=request.user)
+        conversation = ChatConversation.objects.select_related("context_snapshot").get(
+            id=conversation_id, user=request.user
+        )
     except ChatConversation.DoesNotExist:
         return JsonResponse({"success": False, "error": "Conversation non trouvée"}, status=404)
 
-    # Save user message
-    user_message = ChatMessage.objects.create(
-        conversation=conversation,
-        role="user",
-        content=message_content,
-        status="completed",
-    )
-
-    # Create pending assistant message
-    assistant_message = ChatMessage.objects.create(
-        conversation=conversation,
-        role="assistant",
-        content="",
-        status="pending",
+    # Save user message and the pending assistant message (single INSERT)
+    user_message, assistant_message = conversation.bulk_add_messages(
+        [
+            {"role": "user", "content": message_content, "status": "completed"},
+            {"role": "assistant", "content": "", "status": "pending"},
+        ]
     )
 
-    # Build history from previous messages
+    # Build history from previous messages (recent messages only, bounded payload)
     history = []
-    for msg in conversation.get_messages().exclude(id=assistant_message.id):
+    for msg in conversation.get_recent_messages():
+        # The pending assistant message created above has no content yet
         if msg.status == "completed" and msg.content:
             history.append({"role": msg.role, "content": msg.content})
 
     # Prepare payload
-    user_context = conversation.context_snapshot or _build_user_context(
+    user_context = conversation.get_context() or _build_user_context(
         request.user, coaching_type=conversation.coaching_type
     )
     payload = {
@@ -1668,7 +1628,7 @@ def chat_message_stream_view(request):
             # Save the complete response
             assistant_message.content = "".join(full_response)
             assistant_message.status = "completed"
-            assistant_message.save()
+            assistant_message.save(update_fields=["content", "status"])
 
             logger.info(f"Streaming message completed for conversation {conversation.id}")
 
@@ -1676,7 +1636,7 @@ def chat_message_stream_view(request):
             logger.error(f"Streaming message failed: {e}")
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
             assistant_message.status = "failed"
-            assistant_message.save()
+            assistant_message.save(update_fields=["status"])
 
     # Return message IDs in first event
     def wrapped_stream():
@@ -1724,6 +1684,13 @@ def success_list_view(request):
     )
 
 
+def _clean_skills_demonstrated(value) -> list[str]:
+    """Coerce client-provided skills to the ProfessionalSuccess.skills_demonstrated array shape."""
+    if not isinstance(value, list):
+        return []
+    return [str(s)[:100] for s in value if s]
+
+
 @login_required
 @require_POST
 def success_create_view(request):
@@ -1753,7 +1720,7 @@ def success_create_view(request):
         task=data.get("task", ""),
         action=data.get("action", ""),
         result=data.get("result", ""),
-        skills_demonstrated=data.get("skills_demonstrated", []),
+        skills_demonstrated=_clean_skills_demonstrated(data.get("skills_demonstrated", [])),
         source_conversation=source_conversation,
         is_draft=data.get("is_draft", True),
     )
@@ -1798,7 +1765,7 @@ def success_update_view(request, success_id):
     if "result" in data:
         success.result = data["result"]
     if "skills_demonstrated" in data:
-        success.skills_demonstrated = data["skills_demonstrated"]
+        success.skills_demonstrated = _clean_skills_demonstrated(data["skills_demonstrated"])
     if "is_draft" in data:
         success.is_draft = data["is_draft"]
     if "is_active" in data:
@@ -1844,12 +1811,20 @@ def success_delete_view(request, success_id):
 # ============================================================================
 
 
+def _clean_key_strengths(value) -> list[str]:
+    """Coerce client-provided key strengths to the Pitch.key_strengths array shape."""
+    if not isinstance(value, list):
+        return []
+    return [str(s)[:100] for s in value if s][:5]
+
+
 @login_required
 @require_GET
 def pitch_list_view(request):
     """List user's pitches."""
     pitches = []
-    for p in request.user.pitches.all():
+    # Word counts and completion come from stored columns: the pitch texts are not fetched
+    for p in request.user.pitches.defer("pitch_30s", "pitch_3min"):
         pitches.append(
             {
                 "id": p.id,
@@ -1895,7 +1870,7 @@ def pitch_create_view(request):
         title=data.get("title", ""),
         pitch_30s=data.get("pitch_30s", ""),
         pitch_3min=data.get("pitch_3min", ""),
-        key_strengths=data.get("key_strengths", []),
+        key_strengths=_clean_key_strengths(data.get("key_strengths", [])),
         target_context=data.get("target_context", ""),
         source_conversation=source_conversation,
         is_draft=data.get("is_draft", True),
@@ -1936,7 +1911,7 @@ def pitch_update_view(request, pitch_id):
     if "pitch_3min" in data:
         pitch.pitch_3min = data["pitch_3min"]
     if "key_strengths" in data:
-        pitch.key_strengths = data["key_strengths"]
+        pitch.key_strengths = _clean_key_strengths(data["key_strengths"])
     if "target_context" in data:
         pitch.target_context = data["target_context"]
     if "is_draft" in data:
@@ -2013,7 +1988,7 @@ def pitch_detail_view(request, pitch_id):
 @login_required
 def applications_list_view(request):
     """Display all user's applications as cards."""
-    applications = Application.objects.filter(user=request.user).select_related("imported_offer", "candidate_profile")
+    applications = Application.objects.filter(user=request.user).for_list()
 
     # Group by status for potential filtering
     status_counts = {
@@ -2042,11 +2017,7 @@ def applications_list_view(request):
 @login_required
 def application_detail_view(request, application_id):
     """Display detailed view of a single application."""
-    application = (
-        Application.objects.filter(id=application_id, user=request.user)
-        .select_related("imported_offer", "candidate_profile")
-        .first()
-    )
+    application = Application.objects.filter(id=application_id, user=request.user).with_offer().first()
 
     if not application:
         from django.http import Http404
@@ -2057,12 +2028,12 @@ def application_detail_view(request, application_id):
     docx_template_config = None
     user = request.user
     if user.docx_template:
-        docx_template_config = json_module.dumps(user.docx_template.to_js_config())
+        docx_template_config = user.docx_template.to_js_config_json()
     else:
         # Use default template if user has no preference
         default_template = DocxTemplate.objects.filter(is_default=True).first()
         if default_template:
-            docx_template_config = json_module.dumps(default_template.to_js_config())
+            docx_template_config = default_template.to_js_config_json()
 
     context = {
         "application": application,
@@ -2086,13 +2057,11 @@ def application_update_status_view(request, application_id):
     valid_statuses = [choice[0] for choice in APPLICATION_STATUS_CHOICES]
 
     if new_status in valid_statuses:
-        old_status = application.status
-        application.status = new_status
-        application.add_history_event(
+        application.record_event(
             "status_changed",
-            f"Statut change de {old_status} a {new_status}",
+            f"Statut change de {application.status} a {new_status}",
+            status=new_status,
         )
-        application.save()
 
     return redirect("accounts:application_detail", application_id=application.id)
 
@@ -2109,10 +2078,11 @@ def application_update_notes_view(request, application_id):
         raise Http404("Candidature non trouvee")
 
     notes = request.POST.get("notes", "")
-    application.notes = notes
     if notes:
-        application.add_history_event("note_added", "Notes mises a jour")
-    application.save()
+        application.record_event("note_added", "Notes mises a jour", notes=notes)
+    else:
+        application.notes = notes
+        application.save(update_fields=["notes", "updated_at"])
 
     return redirect("accounts:application_detail", application_id=application.id)
 
@@ -2137,33 +2107,36 @@ def application_delete_view(request, application_id):
 
 def _build_candidate_context(user, profile=None):
     """Build candidate context from user and profile for AI generation."""
+    # Active extracted lines as plain data, grouped by content_type (one query)
+    lines = user.get_consolidated_profile_data()
+
     # Get experiences from extracted lines
     experiences = []
-    for line in user.extracted_lines.filter(content_type="experience", is_active=True):
+    for line in lines.get("experience", []):
         experiences.append(
             {
-                "entity": line.entity or "",
-                "position": line.position or "",
-                "dates": line.dates or "",
-                "description": line.description or line.content or "",
+                "entity": line["entity"] or "",
+                "position": line["position"] or "",
+                "dates": line["dates"] or "",
+                "description": line["description"] or line["content"] or "",
             }
         )
 
     # Get education
     education = []
-    for line in user.extracted_lines.filter(content_type="education", is_active=True):
+    for line in lines.get("education", []):
         education.append(
             {
-                "entity": line.entity or "",
-                "degree": line.position or "",
-                "dates": line.dates or "",
+                "entity": line["entity"] or "",
+                "degree": line["position"] or "",
+                "dates": line["dates"] or "",
             }
         )
 
     # Get skills
     skills = []
-    for line in user.extracted_lines.filter(content_type__in=["skill_hard", "skill_soft"], is_active=True):
-        skills.append(line.content)
+    for line in [*lines.get("skill_hard", []), *lines.get("skill_soft", [])]:
+        skills.append(line["content"])
 
     # Get professional successes
     successes = []
@@ -2180,8 +2153,8 @@ def _build_candidate_context(user, profile=None):
 
     # Get interests
     interests = []
-    for line in user.extracted_lines.filter(content_type="interest", is_active=True):
-        interests.append(line.content)
+    for line in lines.get("interest", []):
+        interests.append(line["content"])
 
     # Get social links
     social_links = []
@@ -2265,8 +2238,7 @@ def application_generate_cv_view(request, application_id):
         data = response.json()
 
         # Store task_id in application for polling
-        application.add_history_event("cv_generation_started", f"Task ID: {data['task_id']}")
-        application.save()
+        application.record_event("cv_generation_started", f"Task ID: {data['task_id']}")
 
         return JsonResponse(
             {
@@ -2313,8 +2285,7 @@ def application_generate_cover_letter_view(request, application_id):
         data = response.json()
 
         # Store task_id in application for polling
-        application.add_history_event("cover_letter_generation_started", f"Task ID: {data['task_id']}")
-        application.save()
+        application.record_event("cover_letter_generation_started", f"Task ID: {data['task_id']}")
 
         return JsonResponse(
             {
@@ -2372,9 +2343,7 @@ def application_save_cv_view(request, application_id):
     except json_module.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
 
-    application.custom_cv = content
-    application.add_history_event("cv_generated", "CV personnalise genere")
-    application.save()
+    application.record_event("cv_generated", "CV personnalise genere", custom_cv=content)
 
     return JsonResponse({"success": True, "message": "CV enregistre"})
 
@@ -2396,9 +2365,7 @@ def application_save_cover_letter_view(request, application_id):
     except json_module.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
 
-    application.cover_letter = content
-    application.add_history_event("cover_letter_generated", "Lettre de motivation generee")
-    application.save()
+    application.record_event("cover_letter_generated", "Lettre de motivation generee", cover_letter=content)
 
     return JsonResponse({"success": True, "message": "Lettre enregistree"})
 
@@ -49,6 +49,13 @@ class ImportOfferRequestSerializer(serializers.Serializer):
     profileId = serializers.IntegerField(required=False, allow_null=True)
 
 
+class ImportOffersBatchRequestSerializer(serializers.Serializer):
+    """Serializer for importing several offers at once."""
+
+    offers = OfferImportSerializer(many=True, allow_empty=False)
+    profileId = serializers.IntegerField(required=False, allow_null=True)
+
+
 class ImportedOfferSerializer(serializers.ModelSerializer):
     """Serializer for ImportedOffer model (read)."""
 
@@ -103,3 +110,10 @@ class ImportOfferResponseSerializer(serializers.Serializer):
     offerId = serializers.IntegerField()
     matchScore = serializers.FloatField(allow_null=True)
     message = serializers.CharField()
+
+
+class ImportOffersBatchResponseSerializer(serializers.Serializer):
+    """Serializer for batch import response."""
+
+    offerIds = serializers.ListField(child=serializers.IntegerField())
+    message = serializers.CharField()
@@ -0,0 +1,123 @@
+# Tests for the REST API
+from accounts.models import Application, CandidateProfile, ImportedOffer, User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+def offer_payload(url, title="Data engineer", **kwargs):
+    return {
+        "sourceUrl": url,
+        "sourceDomain": "example.com",
+        "title": title,
+        "capturedAt": "2026-10-01T09:00:00Z",
+        **kwargs,
+    }
+
+
+class ImportOfferApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="candidate@example.com", email="candidate@example.com")
+        self.client = APIClient(HTTP_HOST="localhost")
+        self.client.force_authenticate(self.user)
+
+    def create_offer(self, url, **kwargs):
+        return ImportedOffer.objects.create(
+            user=self.user,
+            source_url=url,
+            source_domain="example.com",
+            captured_at=timezone.now(),
+            title="Old title",
+            **kwargs,
+        )
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(reverse("api:offer_import_batch"), {"offers": []}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_import_single_offer(self):
+        payload = {"offer": offer_payload("https://example.com/jobs/1", skills=["Python"])}
+        response = self.client.post(reverse("api:offer_import"), payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        offer = ImportedOffer.objects.get(pk=response.data["offerId"])
+        self.assertEqual(list(offer.skill_set.values_list("name", flat=True)), ["python"])
+        self.assertTrue(Application.objects.filter(user=self.user, imported_offer=offer).exists())
+
+        response = self.client.post(reverse("api:offer_import"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["offerId"], offer.pk)
+        self.assertEqual(ImportedOffer.objects.count(), 1)
+
+    def test_batch_imports_new_offers(self):
+        payload = {
+            "offers": [
+                offer_payload("https://example.com/jobs/1", skills=["Python", "SQL"]),
+                offer_payload("https://example.com/jobs/2"),
+            ]
+        }
+        response = self.client.post(reverse("api:offer_import_batch"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        offers = ImportedOffer.objects.filter(user=self.user).order_by("source_url")
+        self.assertEqual(response.data["offerIds"], [offer.pk for offer in offers])
+        self.assertEqual(sorted(offers[0].skill_set.values_list("name", flat=True)), ["python", "sql"])
+        self.assertEqual(Application.objects.filter(user=self.user).count(), 2)
+
+    def test_batch_refreshes_existing_offer_and_keeps_its_state(self):
+        profile = CandidateProfile.objects.create(user=self.user, title="Data")
+        existing = self.create_offer(
+            "https://example.com/jobs/1", status="saved", match_score=0.8, candidate_profile=profile
+        )
+        payload = {
+            "offers": [
+                offer_payload("https://example.com/jobs/1", title="New title", skills=["Go"]),
+                offer_payload("https://example.com/jobs/2"),
+            ]
+        }
+        response = self.client.post(reverse("api:offer_import_batch"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["offerIds"][0], existing.pk)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.title, "New title")
+        self.assertEqual(existing.status, "saved")
+        self.assertEqual(existing.match_score, 0.8)
+        self.assertEqual(existing.candidate_profile, profile)
+        self.assertEqual(list(existing.skill_set.values_list("name", flat=True)), ["go"])
+        self.assertEqual(ImportedOffer.objects.count(), 2)
+
+    def test_batch_with_duplicate_urls_keeps_last_capture(self):
+        payload = {
+            "offers": [
+                offer_payload("https://example.com/jobs/1", title="First"),
+                offer_payload("https://example.com/jobs/1", title="Second"),
+            ]
+        }
+        response = self.client.post(reverse("api:offer_import_batch"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        offer = ImportedOffer.objects.get()
+        self.assertEqual(response.data["offerIds"], [offer.pk])
+        self.assertEqual(offer.title, "Second")
+        self.assertEqual(Application.objects.filter(imported_offer=offer).count(), 1)
+
+    def test_bulk_ingest_returns_stored_values(self):
+        existing = self.create_offer("https://example.com/jobs/1", status="applied", match_score=0.5)
+        rows = [
+            {
+                "source_url": "https://example.com/jobs/2",
+                "source_domain": "example.com",
+                "captured_at": timezone.now(),
+                "title": "Fresh",
+            },
+            {
+                "source_url": "https://example.com/jobs/1",
+                "source_domain": "example.com",
+                "captured_at": timezone.now(),
+                "title": "Refreshed",
+            },
+        ]
+        fresh, refreshed = ImportedOffer.bulk_ingest(self.user, rows)
+        self.assertEqual((fresh.title, fresh.status, fresh.match_score), ("Fresh", "new", None))
+        self.assertEqual(refreshed.pk, existing.pk)
+        self.assertEqual((refreshed.title, refreshed.status, refreshed.match_score), ("Refreshed", "applied", 0.5))
@@ -13,6 +13,7 @@ from .views import (
     HealthCheckView,
     ImportedOfferDetailView,
     ImportedOfferListView,
+    ImportOffersBatchView,
     ImportOfferView,
     LogoutView,
 )
@@ -34,5 +35,6 @@ urlpatterns = [
     # Offers
     path("offers/", ImportedOfferListView.as_view(), name="offer_list"),
     path("offers/import/", ImportOfferView.as_view(), name="offer_import"),
+    path("offers/import/batch/", ImportOffersBatchView.as_view(), name="offer_import_batch"),
     path("offers/<int:pk>/", ImportedOfferDetailView.as_view(), name="offer_detail"),
 ]
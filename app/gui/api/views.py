@@ -1,8 +1,8 @@
 """REST API views for browser extension integration."""
 
-from accounts.models import Application, CandidateProfile, ImportedOffer
+from accounts.models import Application, CandidateProfile, ImportedOffer, Skill
 from django.db import IntegrityError
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status
 from rest_framework.generics import ListAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -15,10 +15,44 @@ from .serializers import (
     ImportedOfferUpdateSerializer,
     ImportOfferRequestSerializer,
     ImportOfferResponseSerializer,
+    ImportOffersBatchRequestSerializer,
+    ImportOffersBatchResponseSerializer,
     UserSerializer,
 )
 
 
+def _offer_fields(offer_data):
+    """Map a validated OfferImportSerializer payload to ImportedOffer field values."""
+    return {
+        "source_url": offer_data["sourceUrl"],
+        "source_domain": offer_data["sourceDomain"],
+        "captured_at": offer_data["capturedAt"],
+        "title": offer_data["title"],
+        "company": offer_data.get("company", ""),
+        "location": offer_data.get("location", ""),
+        "description": offer_data.get("description", ""),
+        "contract_type": offer_data.get("contractType", ""),
+        "remote_type": offer_data.get("remoteType", ""),
+        "salary": offer_data.get("salary"),
+        "skills": offer_data.get("skills", []),
+    }
+
+
+def _existing_offer_response(user, source_url):
+    """200 response for an offer the user already imported, or None."""
+    existing = ImportedOffer.objects.filter(user=user, source_url=source_url).values("id", "match_score").first()
+    if existing is None:
+        return None
+    response_serializer = ImportOfferResponseSerializer(
+        {
+            "offerId": existing["id"],
+            "matchScore": existing["match_score"],
+            "message": "Offer already imported",
+        }
+    )
+    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
 @extend_schema(tags=["Health"])
 class HealthCheckView(APIView):
     """Health check endpoint."""
@@ -96,6 +130,11 @@ class ImportOfferView(APIView):
         offer_data = serializer.validated_data["offer"]
         profile_id = serializer.validated_data.get("profileId")
 
+        # Re-scraped page: answer from a single indexed lookup instead of a failed INSERT
+        existing_response = _existing_offer_response(request.user, offer_data["sourceUrl"])
+        if existing_response:
+            return existing_response
+
         # Get candidate profile if specified
         candidate_profile = None
         if profile_id:
@@ -106,30 +145,13 @@ class ImportOfferView(APIView):
             imported_offer = ImportedOffer.objects.create(
                 user=request.user,
                 candidate_profile=candidate_profile,
-                source_url=offer_data["sourceUrl"],
-                source_domain=offer_data["sourceDomain"],
-                captured_at=offer_data["capturedAt"],
-                title=offer_data["title"],
-                company=offer_data.get("company", ""),
-                location=offer_data.get("location", ""),
-                description=offer_data.get("description", ""),
-                contract_type=offer_data.get("contractType", ""),
-                remote_type=offer_data.get("remoteType", ""),
-                salary=offer_data.get("salary"),
-                skills=offer_data.get("skills", []),
+                **_offer_fields(offer_data),
             )
         except IntegrityError:
-            # Offer already exists for this user
-            existing = ImportedOffer.objects.filter(user=request.user, source_url=offer_data["sourceUrl"]).first()
-            if existing:
-                response_serializer = ImportOfferResponseSerializer(
-                    {
-                        "offerId": existing.id,
-                        "matchScore": existing.match_score,
-                        "message": "Offer already imported",
-                    }
-                )
-                return Response(response_serializer.data, status=status.HTTP_200_OK)
+            # Imported concurrently since the lookup above
+            existing_response = _existing_offer_response(request.user, offer_data["sourceUrl"])
+            if existing_response:
+                return existing_response
             raise
 
         # TODO: Call matching service to compute match_score
@@ -140,11 +162,11 @@ class ImportOfferView(APIView):
         #
         # For now, match_score is None (not computed)
 
-        # Auto-create Application for this offer (use get_or_create to handle duplicates)
-        Application.objects.get_or_create(
+        # Auto-create Application for this offer (the offer was just created, so it has none yet)
+        Application.objects.create(
             user=request.user,
             imported_offer=imported_offer,
-            defaults={"candidate_profile": candidate_profile},
+            candidate_profile=candidate_profile,
         )
 
         response_serializer = ImportOfferResponseSerializer(
@@ -157,6 +179,47 @@ class ImportOfferView(APIView):
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
 
 
+@extend_schema(tags=["Offers"])
+class ImportOffersBatchView(APIView):
+    """Import several job offers captured by browser extension in one request."""
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="Import offers in batch",
+        description=(
+            "Import several job offers at once. Offers already imported (same URL) are refreshed "
+            "with the captured content; their status and match results are kept."
+        ),
+        request=ImportOffersBatchRequestSerializer,
+        responses={200: ImportOffersBatchResponseSerializer},
+    )
+    def post(self, request):
+        serializer = ImportOffersBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        profile_id = serializer.validated_data.get("profileId")
+        candidate_profile = None
+        if profile_id:
+            candidate_profile = CandidateProfile.objects.filter(id=profile_id, user=request.user).first()
+
+        # Last capture wins when the batch contains the same URL twice (ON CONFLICT cannot
+        # touch a row twice in one statement)
+        rows = {offer["sourceUrl"]: _offer_fields(offer) for offer in serializer.validated_data["offers"]}
+        offers = ImportedOffer.bulk_ingest(request.user, rows.values(), candidate_profile=candidate_profile)
+
+        # Auto-create Applications for new offers (existing ones are left untouched)
+        Application.bulk_create_for_offers(request.user, offers, candidate_profile=candidate_profile)
+
+        response_serializer = ImportOffersBatchResponseSerializer(
+            {
+                "offerIds": [offer.id for offer in offers],
+                "message": f"{len(offers)} offers imported",
+            }
+        )
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
 @extend_schema(tags=["Offers"])
 class ImportedOfferListView(ListAPIView):
     """List all imported offers for the current user."""
@@ -167,12 +230,19 @@ class ImportedOfferListView(ListAPIView):
     @extend_schema(
         summary="List offers",
         description="Returns all imported offers for the authenticated user.",
+        parameters=[
+            OpenApiParameter("skill", str, description="Only offers mentioning this skill (case-insensitive)"),
+        ],
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
     def get_queryset(self):
-        return ImportedOffer.objects.filter(user=self.request.user)
+        queryset = ImportedOffer.objects.filter(user=self.request.user)
+        skill = self.request.query_params.get("skill")
+        if skill:
+            queryset = queryset.filter(skill_set__name=Skill.normalize(skill))
+        return queryset
 
 
 @extend_schema_view(
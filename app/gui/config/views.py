@@ -20,7 +20,11 @@ class HomeView(TemplateView):
             from accounts.models import Application
 
             # Get all applications for the user (scrollable list)
-            recent_applications = Application.objects.filter(user=self.request.user).select_related("imported_offer")
+            recent_applications = (
+                Application.objects.filter(user=self.request.user)
+                .with_offer_headers()
+                .defer("notes", "custom_cv", "cover_letter")
+            )
 
             context["recent_applications"] = recent_applications
             context["applications_count"] = Application.objects.filter(user=self.request.user).count()
@@ -148,8 +148,9 @@ def get_top_offers_for_user(user, top_k: int = 20) -> list[TopOfferResult]:
             # CV text = concatenation of experiences + skills (hard + soft)
             cv_parts = []
 
-            # Get experiences
-            experiences = profile.get_selected_lines_by_type("experience")
+            # Get experiences and skills (single query)
+            selected = profile.get_selected_lines_grouped("experience", "skill_hard", "skill_soft")
+            experiences = selected.get("experience", [])
             for exp in experiences:
                 # Build rich text: position + entity + dates + description (detailed text)
                 parts = []
@@ -171,13 +172,13 @@ def get_top_offers_for_user(user, top_k: int = 20) -> list[TopOfferResult]:
                     cv_parts.append(" ".join(parts))
 
             # Get hard skills
-            hard_skills = profile.get_selected_lines_by_type("skill_hard")
+            hard_skills = selected.get("skill_hard", [])
             skill_texts = [s.content for s in hard_skills if s.content]
             if skill_texts:
                 cv_parts.append("Compétences techniques: " + ", ".join(skill_texts))
 
             # Get soft skills
-            soft_skills = profile.get_selected_lines_by_type("skill_soft")
+            soft_skills = selected.get("skill_soft", [])
             soft_texts = [s.content for s in soft_skills if s.content]
             if soft_texts:
                 cv_parts.append("Soft skills: " + ", ".join(soft_texts))